@@ -1,6 +1,5 @@
+import importlib
 import logging
-import os
-import sys
 
 
 from . import (
@@ -15,21 +14,17 @@ from . import (
     normaldata,
     numutils,
     read_data,
-    report,
     sessionutils,
     stats,
     timedist,
     trial,
     utils,
     videos,
-    viz,
 )
 
 
-# in case we want to print stuff from config.py, it's better to delay
-# the import until this point (after the stdout fix above)
 from .config import cfg
-from .envutils import GaitDataError
+from .envutils import GaitDataError, _run_from_ipython as run_from_ipython
 
 
 # the main purpose of adding the null handler is to disable the
@@ -44,21 +39,11 @@ root_logger.addHandler(logging.NullHandler())
 # root_logger.debug('package init')
 
 
-def run_from_ipython():
-    try:
-        __IPYTHON__
-        return True
-    except NameError:
-        return False
+def __getattr__(name):
+    """Import the plotting and report subpackages on first access.
 
-
-# fake stdout and stderr if run under pythonw.exe on Windows;
-# this prevents errors on print() calls
-# also if no stdout output is desired, the same lines accomplish that
-if cfg.general.quiet_stdout or (
-    sys.platform.find('win') != -1
-    and sys.executable.find('pythonw') != -1
-    and not run_from_ipython()
-):
-    blackhole = open(os.devnull, 'w')
-    sys.stdout = sys.stderr = blackhole
+    These pull in matplotlib, plotly and dash, which take a while to import.
+    """
+    if name in ('report', 'viz'):
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
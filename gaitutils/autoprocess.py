@@ -14,8 +14,20 @@ import time
 import logging
 import itertools
 import shutil
-
-from . import nexus, eclipse, utils, sessionutils, read_data, videos, events
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from . import (
+    nexus,
+    eclipse,
+    utils,
+    sessionutils,
+    read_data,
+    videos,
+    events,
+    config,
+    envutils,
+)
 from .envutils import GaitDataError
 from .config import cfg
 from .gui.qt_widgets import ProgressSignals
@@ -310,7 +322,7 @@ def _do_autoproc(enffiles, signals=None, pipelines_in_proc=True):
     sel_trials = {
         filepath: trial for filepath, trial in trials.items() if trial['recon_ok']
     }
-    logger.debug('\n2nd pass - processing %d trials\n' % len(sel_trials))
+    logger.debug('\n2nd pass - processing %d trials\n', len(sel_trials))
 
     for ind, (filepath, trial_info) in enumerate(sel_trials.items()):
         filename = filepath.name
@@ -394,8 +406,8 @@ def _do_autoproc(enffiles, signals=None, pipelines_in_proc=True):
 
     # print stats
     logger.debug('Complete')
-    logger.debug('Trials opened: %d' % len(trials))
-    logger.debug('Trials with recon ok: %d' % len(sel_trials))
+    logger.debug('Trials opened: %d', len(trials))
+    logger.debug('Trials with recon ok: %d', len(sel_trials))
 
 
 def _delete_c3ds(enffiles):
@@ -428,7 +440,8 @@ def _delete_c3ds(enffiles):
         else:
             logger.debug(
                 'refusing to delete c3d file %s since original '
-                'data files .(x1d and .x2d) do not exist' % c3dfile
+                'data files .(x1d and .x2d) do not exist',
+                c3dfile,
             )
 
 
@@ -490,25 +503,56 @@ def automark_trial(plot=False):
     nexus._create_events(vicon, evs)
 
 
+def _setup_console_entry():
+    """Prepare the environment for the console entry points below.
+
+    The GUI also calls the autoprocessing functions, so this is not done by the
+    functions themselves.
+    """
+    config.ensure_user_config()
+    envutils._redirect_pythonw_streams()
+
+
+def _autoproc_session_cli():
+    """Console entry point for autoproc_session()"""
+    _setup_console_entry()
+    autoproc_session()
+
+
+def _autoproc_trial_cli():
+    """Console entry point for autoproc_trial()"""
+    _setup_console_entry()
+    autoproc_trial()
+
+
+def _automark_trial_cli():
+    """Console entry point for automark_trial()"""
+    _setup_console_entry()
+    automark_trial()
+
+
 def _copy_session_videos():
     """Copy Nexus session videos to desktop"""
     nexus._check_nexus()
 
     dest_dir = Path.home() / 'Desktop' / 'nexus_videos'
-    if not dest_dir.is_dir():
-        os.mkdir(dest_dir)
+    os.makedirs(dest_dir, exist_ok=True)
 
     sessionpath = nexus.get_sessionpath()
     c3dfiles = sessionutils.get_c3ds(
         sessionpath, tags=cfg.eclipse.repr_tags, trial_type='dynamic'
     )
-    vidfiles = itertools.chain.from_iterable(
-        videos.get_trial_videos(c3d, vid_ext='.avi') for c3d in c3dfiles
-    )
-    vidfiles = list(vidfiles)
-    if not vidfiles:
-        raise GaitDataError('No video files found for representative trials')
 
-    for vidfile in vidfiles:
+    def _copy(vidfile):
         logger.debug(f'copying {vidfile} -> {dest_dir}')
         shutil.copy2(vidfile, dest_dir)
+
+    # both the video globs and the copies are I/O bound (the session is often
+    # on a network share), so run them concurrently; shutil already uses the
+    # fast OS copy calls
+    get_avis = partial(videos.get_trial_videos, vid_ext='.avi')
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        vidfiles = list(itertools.chain.from_iterable(executor.map(get_avis, c3dfiles)))
+        if not vidfiles:
+            raise GaitDataError('No video files found for representative trials')
+        list(executor.map(_copy, vidfiles))
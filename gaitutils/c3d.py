@@ -14,6 +14,7 @@ import numpy as np
 from pathlib import Path
 import sys
 import shutil
+import threading
 
 from .numutils import center_of_pressure, _change_coords, _is_ascii
 from .events import GaitEvents, GaitEvent
@@ -32,6 +33,10 @@ except ImportError:
     BTK_IMPORTED = False
     logger.warning('cannot import btk module; unable to read .c3d files')
 
+# btk makes no thread safety guarantees, so the file reads are serialized;
+# the acquisitions that they return are independent of each other
+_btk_read_lock = threading.Lock()
+
 
 def _is_c3d_file(source):
     """Check if source is a valid c3d file.
@@ -77,8 +82,15 @@ def _get_c3d_metadata_field(acq, field, subfield):
 def _get_c3dacq(c3dfile):
     """Get a btk c3dacq object.
 
-    Object is returned from cache if filename and digest match.
+    Object is returned from cache if filename and digest match. Reads from
+    different threads are serialized.
     """
+    with _btk_read_lock:
+        return _read_c3dacq(c3dfile)
+
+
+def _read_c3dacq(c3dfile):
+    """Read a btk c3dacq object from file"""
     reader = btk.btkAcquisitionFileReader()
     c3dfile = str(c3dfile)  # accept Path objects too (btk won't eat those)
     reader.SetFilename(c3dfile)
@@ -344,9 +356,7 @@ def _get_model_data(c3dfile, model):
             modeldata[var] = np.transpose(np.squeeze(vals))
         except RuntimeError:
             logger.info(f'cannot read model variable {var}, returning nans')
-            data = np.empty(var_dims)
-            data[:] = np.nan
-            modeldata[var] = data
+            modeldata[var] = np.full(var_dims, np.nan)
         # c3d stores scalars as last dim of 3-d array
         if model.read_strategy == 'last':
             modeldata[var] = modeldata[var][2, :]
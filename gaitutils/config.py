@@ -8,7 +8,7 @@ Handles gaitutils config files.
 from pathlib import Path
 import io
 import logging
-from pkg_resources import resource_filename
+from importlib.resources import files
 from configdot import parse_config, update_config, dump_config
 
 
@@ -17,6 +17,13 @@ from configdot import parse_config, update_config, dump_config
 logger = logging.getLogger(__name__)
 
 
+def _resource_filename(resource):
+    """Return the filename of a resource in the gaitutils package"""
+    # importlib.resources is much cheaper than pkg_resources, which imports a
+    # large part of setuptools
+    return str(files('gaitutils') / resource)
+
+
 def _handle_cfg_defaults(cfg):
     """Handle deprecated and default config values"""
     if isinstance(cfg.plot.emg_yscale, tuple):
@@ -24,16 +31,16 @@ def _handle_cfg_defaults(cfg):
         logger.warning(f'emg_yscale was changed to a float variable, using {ysc}')
         cfg.plot.emg_yscale = str(cfg.plot.emg_yscale[1])
     if cfg.general.normaldata_files == 'default':
-        fn = resource_filename('gaitutils', 'data/normal.gcd')
+        fn = _resource_filename('data/normal.gcd')
         cfg.general.normaldata_files = [fn]
     if cfg.general.timedist_normaldata == 'default':
-        fn = resource_filename('gaitutils', 'data/timedist_normaldata.json')
+        fn = _resource_filename('data/timedist_normaldata.json')
         cfg.general.timedist_normaldata = fn
     if cfg.emg.normaldata_file == 'default':
-        fn = resource_filename('gaitutils', 'data/emg_normaldata.json')
+        fn = _resource_filename('data/emg_normaldata.json')
         cfg.emg.normaldata_file = fn
     if cfg.general.videoconv_path == 'default':
-        fn = resource_filename('gaitutils', 'thirdparty/ffmpeg.exe')
+        fn = _resource_filename('thirdparty/ffmpeg.exe')
         cfg.general.videoconv_path = fn
     if cfg.autoproc.write_eclipse_fp_info is True:
         cfg.autoproc.write_eclipse_fp_info = 'write'
@@ -50,35 +57,101 @@ def _handle_cfg_defaults(cfg):
 
 
 # location of the default config file
-cfg_template_fn = resource_filename(__name__, 'data/default.cfg')
+cfg_template_fn = _resource_filename('data/default.cfg')
 # Location of the user specific config file. On Windows, this typically puts the
 # config at C:\Users\Username, since the USERPROFILE environment variable points
 # there. Putting the config in a networked home dir requires some tinkering with
 # environment variables (e.g. setting HOME)
 cfg_user_fn = Path.home() / '.gaitutils.cfg'
 
-# provide the global cfg instance
-# read template config
-cfg = parse_config(cfg_template_fn)
-if cfg_user_fn.is_file():
-    logger.debug(f'reading user config from {cfg_user_fn}')
-    cfg_user = parse_config(cfg_user_fn)
-    # update config from user file, but do not overwrite comments
-    # new config items are only allowed in layouts section
-    update_config(
-        cfg,
-        cfg_user,
-        create_new_sections=False,
-        create_new_items=['layouts'],
-        update_comments=False,
-    )
-else:
+
+def _read_config():
+    """Read the template config and update it from the user config file"""
+    cfg = parse_config(cfg_template_fn)
+    if cfg_user_fn.is_file():
+        logger.debug(f'reading user config from {cfg_user_fn}')
+        cfg_user = parse_config(cfg_user_fn)
+        # update config from user file, but do not overwrite comments
+        # new config items are only allowed in layouts section
+        update_config(
+            cfg,
+            cfg_user,
+            create_new_sections=False,
+            create_new_items=['layouts'],
+            update_comments=False,
+        )
+    else:
+        logger.debug(f'no user config file {cfg_user_fn}, using defaults')
+    _handle_cfg_defaults(cfg)
+    return cfg
+
+
+def ensure_user_config():
+    """Create the user config file from the template, if it does not exist.
+
+    This is intended to be called by the application entry points; importing
+    the package does not touch the user config file.
+    """
+    if cfg_user_fn.is_file():
+        return
     logger.warning(f'no config file, trying to create {cfg_user_fn}')
-    cfg_txt = dump_config(cfg)
+    cfg_txt = dump_config(parse_config(cfg_template_fn))
     with io.open(cfg_user_fn, 'w', encoding='utf8') as f:
         f.writelines(cfg_txt)
 
-_handle_cfg_defaults(cfg)
+
+class _ConfigProxy:
+    """Lazily loaded config.
+
+    Delegates all access to the actual config instance (a configdot
+    ConfigContainer), which is read from the config files on first access.
+    Thus, importing the package does not parse the config files until some
+    config value is actually needed.
+    """
+
+    def __init__(self):
+        # bypass our own __setattr__ (which delegates to the config)
+        self.__dict__['_cfg'] = None
+
+    def _get_cfg(self):
+        """Return the actual config instance, reading it if necessary"""
+        if self._cfg is None:
+            self.__dict__['_cfg'] = _read_config()
+        return self._cfg
+
+    def __getattr__(self, attr):
+        # copy and pickle create instances without calling __init__ and look
+        # up special methods; do not delegate those (or recurse on _cfg)
+        if attr.startswith('__') or '_cfg' not in self.__dict__:
+            raise AttributeError(attr)
+        return getattr(self._get_cfg(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._get_cfg(), attr, value)
+
+    def __getitem__(self, item):
+        return self._get_cfg()[item]
+
+    def __setitem__(self, item, value):
+        self._get_cfg()[item] = value
+
+    def __contains__(self, item):
+        return item in self._get_cfg()
+
+    def __iter__(self):
+        return iter(self._get_cfg())
+
+    def __eq__(self, other):
+        if isinstance(other, _ConfigProxy):
+            other = other._get_cfg()
+        return self._get_cfg() == other
+
+    def __repr__(self):
+        return repr(self._get_cfg())
+
+
+# provide the global cfg instance
+cfg = _ConfigProxy()
 
 # if using print for config messages:
 # sys.stdout.flush()  # make sure that warnings are printed out
@@ -26,6 +26,12 @@ class EMG:
         The data source. Can be a c3d filename or a ViconNexus instance.
     correction_factor : int, optional
         After read, the EMG data is multiplied by this factor.
+
+    Notes
+    -----
+    The data is cached, and the filtered and enveloped data computed from it
+    are cached too. To keep the caches consistent, the cached arrays are
+    read-only; copy the data before modifying it.
     """
 
     def __init__(self, source, correction_factor=1, chs_disabled=None):
@@ -40,13 +46,33 @@ class EMG:
             self.trialname = None
         self.passband = cfg.emg.passband
         self._data = None
+        self._data_matrix = None
+        self._ch_index = None
+        # cache for filtered/enveloped data, see _get_channel_data()
+        self._filt_cache = dict()
+        # cache for channel name matches, see _match_name()
+        self._name_cache = dict()
+        self._names_by_length = None
         self.t = None
         self.sfrate = None
-        self.correction_factor = correction_factor
+        self._correction_factor = correction_factor
         self.chs_disabled = chs_disabled
         if self.chs_disabled is None:
             self.chs_disabled = list()
 
+    @property
+    def correction_factor(self):
+        """The factor that the EMG data is multiplied by after read"""
+        return self._correction_factor
+
+    @correction_factor.setter
+    def correction_factor(self, factor):
+        # the factor is applied when the data is read, so any data that was
+        # already read with another factor has to be read again
+        if factor != self._correction_factor:
+            self._correction_factor = factor
+            self._data = None
+
     def _check_nexus_trial_still_valid(self):
         """Check if Nexus still has the original trial loaded.
 
@@ -66,14 +92,18 @@ class EMG:
         Returns
         -------
         dict
-            The EMG data, keyed by channel name. Values are shape (N,) ndarrays
-            of sample values.
+            The EMG data, keyed by channel name. Values are shape (N,) read-only
+            ndarrays of sample values.
         """
+        self._ensure_data()
+        return self._data
+
+    def _ensure_data(self):
+        """Read the EMG data from source, unless already read"""
         if self._data is None:
             if self._source_is_nexus:
                 self._check_nexus_trial_still_valid()
             self._read_data()
-        return self._data
 
     def _read_data(self):
         """Actually read the EMG data from source"""
@@ -81,8 +111,26 @@ class EMG:
         logger.debug(f"reading EMG from {meta['trialname']}")
         self.sfrate = meta['analograte']
         emgdi = read_data.get_emg_data(self.source)
-        self._data = emgdi['data']
         self.t = emgdi['t']
+        # the data is stored as a single (nchannels, nsamples) array; the data
+        # dict holds row views into it
+        chnames = list(emgdi['data'])
+        dtype = np.dtype(cfg.emg.dtype)
+        if chnames:
+            self._data_matrix = np.stack([emgdi['data'][ch] for ch in chnames])
+            self._data_matrix = self._data_matrix.astype(dtype, copy=False)
+            # apply the correction once here, instead of on every data request
+            if self.correction_factor != 1:
+                self._data_matrix *= self.correction_factor
+        else:
+            self._data_matrix = np.empty((0, len(self.t)), dtype=dtype)
+        # read-only, so that the filtered data cache cannot get out of sync
+        self._data_matrix.setflags(write=False)
+        self._ch_index = {ch: ind for ind, ch in enumerate(chnames)}
+        self._data = {ch: self._data_matrix[ind] for ch, ind in self._ch_index.items()}
+        self._filt_cache = dict()
+        self._name_cache = dict()
+        self._names_by_length = sorted(self._data, key=len)
 
     def _edf_export(self, filename):
         """Export the EMG data to EDF format.
@@ -134,19 +182,55 @@ class EMG:
         f.writeSamples(data_list)
         f.close()
 
+    def _match_names(self, chnames):
+        """Fuzzily match several channel names.
+
+        Names that are not already cached are matched in a single pass over the
+        channel names in the data. Returns a dict keyed by the given names;
+        values are the matching channel names, or None for no match.
+        """
+        chnames = list(chnames)
+        for chname in chnames:
+            # an empty name would match anything
+            if not (isinstance(chname, str) and chname):
+                raise ValueError(f'invalid channel name: {chname}')
+        self._ensure_data()  # (resets the name cache on read)
+        # unique names not already in the cache, in original order
+        todo = list()
+        for chname in dict.fromkeys(chnames):
+            if chname in self._name_cache:
+                continue
+            if len(chname) < 2:
+                # a single character would match almost anything, so treat it
+                # as no match
+                logger.warning(f'EMG channel name {chname} is too short to match')
+                self._name_cache[chname] = None
+            else:
+                todo.append(chname)
+        if todo:
+            matches = {chname: list() for chname in todo}
+            # names are sorted by length, so the first match is the shortest one
+            for x in self._names_by_length:
+                for chname in todo:
+                    if chname in x:
+                        matches[chname].append(x)
+            for chname, chmatches in matches.items():
+                if len(chname) < 3:
+                    logger.warning('Use of very short EMG channel names is discouraged')
+                # choose shortest matching name
+                ch = chmatches[0] if chmatches else None
+                if len(chmatches) > 1:
+                    logger.warning(
+                        f'multiple channel matches for {chname}: {chmatches} -> {ch}'
+                    )
+                self._name_cache[chname] = ch
+        return {chname: self._name_cache[chname] for chname in chnames}
+
     def _match_name(self, chname):
         """Fuzzily match channel name"""
-        if not isinstance(chname, str):
-            raise ValueError(f'invalid channel name: {chname}')
-        if len(chname) < 3:
-            logger.warning('Use of very short EMG channel names is discouraged')
-        matches = [x for x in self.data if x.find(chname) >= 0]
-        if len(matches) == 0:
+        ch = self._match_names([chname])[chname]
+        if ch is None:
             raise KeyError(f'No matching channel for {chname}')
-        else:
-            ch = min(matches, key=len)  # choose shortest matching name
-        if len(matches) > 1:
-            logger.warning(f'multiple channel matches for {chname}: {matches} -> {ch}')
         return ch
 
     def get_channel_data(self, chname, envelope=False):
@@ -171,18 +255,43 @@ class EMG:
         Returns
         -------
         ndarray
-            The data, shape (N,).
+            The data, shape (N,). This is a read-only view into cached data.
         """
         ch = self._match_name(chname)
-        data = self.data[ch]
+        return self._get_channel_data(ch, envelope=envelope)
+
+    def _get_channel_data(self, ch, envelope=False):
+        """Return EMG data for an already matched channel name"""
+        self._ensure_data()
+        # the processed data is computed for all channels at once and cached;
+        # the correction factor was already applied on read
         if envelope:
-            data = numutils.envelope(data, self.sfrate)
+            key = (
+                'envelope',
+                cfg.emg.envelope_method,
+                cfg.emg.rms_win,
+                cfg.emg.linear_envelope_lowpass,
+            )
         elif self.passband:  # no filtering for RMS data
-            # filtered data is currently not cached; _filtfilt() call typically
-            # takes less than 1 ms, so this should not be a problem, unless a
-            # huge number of calls are made
-            data = numutils._filtfilt(data, self.passband, self.sfrate)
-        return data * self.correction_factor
+            key = ('filtered', tuple(self.passband), self.sfrate)
+        else:
+            key = None
+        if key is None:
+            data = self._data_matrix
+        else:
+            if key not in self._filt_cache:
+                if envelope:
+                    self._filt_cache[key] = numutils.envelope(
+                        self._data_matrix, self.sfrate, axis=1
+                    )
+                else:
+                    sos = numutils._butter_sos(tuple(self.passband), self.sfrate)
+                    self._filt_cache[key] = numutils._filtfilt_sos(
+                        self._data_matrix, sos, axis=1
+                    )
+                self._filt_cache[key].setflags(write=False)
+            data = self._filt_cache[key]
+        return data[self._ch_index[ch]]
 
     def has_channel(self, chname):
         """Check whether a channel exists in the data.
@@ -218,15 +327,38 @@ class EMG:
         bool
             True if the channel exists and has valid data, False otherwise.
         """
-        if not self.has_channel(chname):
+        try:
+            ch = self._match_name(chname)
+        except KeyError:
             return False
-        elif chname in self.chs_disabled:
+        if chname in self.chs_disabled:
             return False
         elif cfg.emg.chs_disabled and chname in cfg.emg.chs_disabled:
             return False
-        data = self.get_channel_data(chname)
+        data = self._get_channel_data(ch)
         return self._is_valid_emg(data) if cfg.emg.autodetect_bads else True
 
+    def channel_statuses(self, chnames):
+        """Check several channels for existence and valid EMG signal.
+
+        Equivalent to calling status_ok() for each channel, but the names are
+        matched in a single pass over the data.
+
+        Parameters
+        ----------
+        chnames : list
+            The desired channel names. Name matching is used (see docstring
+            for get_channel_data)
+
+        Returns
+        -------
+        dict
+            Channel status (bool) keyed by the given channel names.
+        """
+        chnames = list(chnames)
+        self._match_names(chnames)
+        return {chname: self.status_ok(chname) for chname in chnames}
+
     @staticmethod
     def context_ok(chname, context):
         """Check if the channel context matches given context.
@@ -251,8 +383,22 @@ class EMG:
         return True
 
     def _is_valid_emg(self, data):
-        """Check whether channel contains a valid EMG signal."""
-        return cfg.emg.variance_ok[0] < np.var(data) < cfg.emg.variance_ok[1]
+        """Check whether channel contains a valid EMG signal.
+
+        For long signals, a strided subsample is checked first. Since the
+        squared deviations of the subsample are part of those of the full
+        signal, n * var(data) >= n_sub * var(subsample). Thus a channel can be
+        rejected early if the subsample alone shows too much variance. In all
+        other cases the full variance decides.
+        """
+        subsample_len = 4096  # min. number of samples for the subsample
+        var_lo, var_hi = cfg.emg.variance_ok
+        step = len(data) // subsample_len
+        if step > 1:
+            sub = data[::step]
+            if len(sub) * np.var(sub) / len(data) >= var_hi:
+                return False
+        return var_lo < np.var(data) < var_hi
 
 
 class AvgEMG(EMG):
@@ -270,6 +416,8 @@ class AvgEMG(EMG):
 
     def __init__(self, avgdata, stddata=None):
         self.chs_disabled = list()  # not supported at the moment
+        self._name_cache = dict()
+        self._names_by_length = sorted(avgdata, key=len)
         self._avgdata = avgdata
         self._stddata = stddata
 
@@ -278,6 +426,9 @@ class AvgEMG(EMG):
         """Get the averaged RMS data."""
         return self._avgdata
 
+    def _ensure_data(self):
+        pass  # the averaged data is always available
+
     def get_channel_data(self, chname, envelope=None):
         if not envelope:
             raise RuntimeError('AvgEMG can only return enveloped and averaged data')
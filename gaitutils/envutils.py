@@ -11,7 +11,6 @@ import sys
 import traceback
 import subprocess
 from ulstools import env
-from pkg_resources import resource_filename
 import logging
 import hashlib
 import os
@@ -25,7 +24,7 @@ from .gui._windows import error_exit
 logger = logging.getLogger(__name__)
 
 
-pkg_dir = Path(resource_filename('gaitutils', ''))  # package directory
+pkg_dir = Path(__file__).parent  # package directory
 pkg_parent = pkg_dir.parent
 # True if package was imported from a git repository
 git_mode = (pkg_parent / '.git').is_dir()
@@ -35,11 +34,18 @@ class GaitDataError(Exception):
     """Custom exception class to indicate gait data related errors"""
 
 
-def _ipython_setup():
-    """Performs some IPython magic if we are running in IPython"""
+def _run_from_ipython():
+    """Check whether we are running in IPython"""
     try:
         __IPYTHON__
+        return True
     except NameError:
+        return False
+
+
+def _ipython_setup():
+    """Performs some IPython magic if we are running in IPython"""
+    if not _run_from_ipython():
         return
     from IPython import get_ipython
 
@@ -52,11 +58,49 @@ def _ipython_setup():
     # np.set_printoptions(precision=3)
 
 
+def _redirect_pythonw_streams():
+    """Redirect stdout and stderr to the null device, if needed.
+
+    Fakes stdout and stderr if run under pythonw.exe on Windows; this prevents
+    errors on print() calls. Also if no stdout output is desired
+    (general.quiet_stdout), the same lines accomplish that. Intended to be
+    called once by the application entry points.
+    """
+    from .config import cfg
+
+    if cfg.general.quiet_stdout or (
+        sys.platform.find('win') != -1
+        and sys.executable.find('pythonw') != -1
+        and not _run_from_ipython()
+    ):
+        blackhole = open(os.devnull, 'w')
+        sys.stdout = sys.stderr = blackhole
+
+
 def _make_gaitutils_shortcut():
     """Makes a desktop shortcut to gaitmenu gui."""
+    from . import config
+
+    config.ensure_user_config()
+    _redirect_pythonw_streams()
     env.make_shortcut('gaitutils', 'gui/gaitmenu.py', 'gaitutils menu')
 
 
+def _git_output(args):
+    """Run a git command in the package repository and return its output"""
+    startupinfo = None
+    if os.name == 'nt':
+        # hides the console on Windows
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return subprocess.check_output(
+        ['git'] + args,
+        cwd=pkg_parent,
+        encoding='utf-8',
+        startupinfo=startupinfo,
+    ).strip()
+
+
 def _git_update():
     """Update the package git repository.
 
@@ -69,32 +113,30 @@ def _git_update():
 
     Since this update mechanism is a bit fragile, it is not used by default.
 
+    The local and remote commits are compared first, so that a pull is only
+    done if there actually is something to update.
+
     Return True if update was ran, else False.
     """
 
-    if git_mode:
-        logger.info('running git update')
-        try:
-            startupinfo = None
-            if os.name == 'nt':
-                # hides the console on Windows
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            o = subprocess.check_output(
-                ['git', 'pull'],
-                cwd=pkg_parent,
-                encoding='utf-8',
-                startupinfo=startupinfo,
-            )
-        except subprocess.CalledProcessError:
-            status = (False, 'cannot retrieve or merge update')
-        if 'lready' in o:
-            status = (False, 'package already up to date')
-        else:
-            status = (True, o)
-    else:  # not a git repo
-        status = (False, 'cannot update, gaitutils is not installed in git mode')
-    return status
+    if not git_mode:
+        return (False, 'cannot update, gaitutils is not installed in git mode')
+    logger.info('running git update')
+    try:
+        # upstream of the current branch, e.g. 'origin/master'
+        upstream = _git_output(
+            ['rev-parse', '--abbrev-ref', '--symbolic-full-name', '@{u}']
+        )
+        remote, branch = upstream.split('/', 1)
+        local_sha = _git_output(['rev-parse', 'HEAD'])
+        remote_out = _git_output(['ls-remote', remote, f'refs/heads/{branch}'])
+        remote_sha = remote_out.split()[0] if remote_out else None
+        if remote_sha == local_sha:
+            return (False, 'package already up to date')
+        o = _git_output(['pull', '--quiet', '--ff-only'])
+    except (subprocess.CalledProcessError, OSError, ValueError):
+        return (False, 'cannot retrieve or merge update')
+    return (True, o or f'updated to {remote_sha}')
 
 
 def _register_gui_exception_handler(full_traceback=False):
@@ -6,26 +6,24 @@ PyQt graphical interface to gaitutils
 @author: Jussi (jnu@iki.fi)
 """
 
-from PyQt5 import QtGui, QtCore, uic, QtWidgets
+from PyQt5 import QtGui, QtCore, QtWidgets
 from PyQt5.QtCore import QRunnable, QThreadPool, pyqtSignal, QObject
-from pkg_resources import resource_filename
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 import sys
+import http.client
 import time
-import requests
+import itertools
 import logging
+import logging.handlers
+import queue
 import traceback
-import socket
 import platform
 import subprocess
 from pathlib import Path
 import ulstools
 import configdot
 
-# this is needed to work around a plotly bug (?) that causes ImportErrors due to
-# circular imports; see https://stackoverflow.com/questions/66149087/getting-import-error-quite-randomly-when-using-plotly-express-and-having-multipl
-from plotly import validator_cache, graph_objects
-
 from .qt_dialogs import (
     OptionsDialog,
     qt_message_dialog,
@@ -33,26 +31,35 @@ from .qt_dialogs import (
     ChooseSessionsDialog,
     qt_matplotlib_window,
     qt_dir_chooser,
+    load_ui,
+    _ui_widget_names,
+)
+from .qt_widgets import (
+    QtHandler,
+    ProgressBar,
+    ProgressSignals,
+    XStream,
+    TrialTableModel,
 )
-from .qt_widgets import QtHandler, ProgressBar, ProgressSignals, XStream
 from ulstools.num import check_hetu
-from ..videos import _collect_session_videos, convert_videos
-from .. import GaitDataError, nexus, cfg, sessionutils, envutils, c3d, stats, trial
-from . import _tardieu
+from ..videos import _collect_session_videos, _videos_to_convert, convert_videos
+from .. import (
+    GaitDataError,
+    nexus,
+    cfg,
+    config,
+    sessionutils,
+    envutils,
+    c3d,
+    stats,
+    trial,
+)
 from ..autoprocess import (
     autoproc_session,
     autoproc_trial,
     automark_trial,
     _copy_session_videos,
 )
-from ..viz.plots import (
-    plot_trials,
-    plot_trial_timedep_velocities,
-    plot_trial_velocities,
-)
-from ..viz.timedist import plot_session_average
-from ..viz.plot_misc import _browse_localhost, _show_plotly_fig
-from ..report import web, pdf
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +70,118 @@ DEBUG_MODE = False
 if DEBUG_MODE:
     import debugpy
 
+# max number of threads for loading c3d trials
+MAX_LOAD_WORKERS = 4
+
+
+def _import_plotting():
+    """Import the plotting modules on the GUI thread.
+
+    The plotting and report modules pull in matplotlib, plotly and dash, so they
+    are imported only when first needed instead of at startup. Importing plotly
+    for the first time in a worker thread may cause ImportErrors due to circular
+    imports, so this should be called before launching any plotting threads; see
+    https://stackoverflow.com/questions/66149087/getting-import-error-quite-randomly-when-using-plotly-express-and-having-multipl
+    """
+    from plotly import validator_cache, graph_objects
+    from .. import viz, report
+
+    return viz, report
+
+
+def _shutdown_report_server(port):
+    """Request shutdown of the web report server running on given port.
+
+    Errors are logged but not raised, since a server that is already dead
+    should not prevent removal of the report.
+    """
+    # send the shutdown request (see report.web) directly over a plain
+    # connection; this also ensures that localhost is not proxied
+    logger.debug('requesting server shutdown for port %d', port)
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+    try:
+        conn.request('GET', '/shutdown')
+        conn.getresponse().read()
+    except (OSError, http.client.HTTPException) as e:
+        logger.warning(f'could not shut down report server on port {port}: {e}')
+    finally:
+        conn.close()
+
+
+def _load_trials(c3dfiles):
+    """Load trials from c3d files concurrently.
+
+    Returns a list of (c3dfile, result) tuples in the original order. The
+    result is either a Trial instance or the exception raised while loading
+    the file.
+    """
+
+    def _load(c3dfile):
+        # return any exception instead of raising it, so that a single bad
+        # file does not lose the whole batch
+        try:
+            return trial.Trial(c3dfile)
+        except Exception as e:
+            logger.debug(f'could not load {c3dfile}', exc_info=True)
+            return e
+
+    # the btk file reads are serialized in c3d._get_c3dacq, and the config is
+    # only read by the workers; what overlaps is the file hashing and the
+    # processing of the independent acquisitions, which gains little from
+    # many threads
+    with ThreadPoolExecutor(max_workers=MAX_LOAD_WORKERS) as executor:
+        return list(zip(c3dfiles, executor.map(_load, c3dfiles)))
+
+
+def _serve_until_shutdown(server):
+    """Run a web report server until shutdown is requested, then close it"""
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def _export_edfs(exports, signals):
+    """Export EMG data of trials into EDF files.
+
+    exports is a list of (trial, filename) tuples. Progress is emitted via
+    signals after each file. Returns a tuple of (exported, errors), where
+    exported is a list of the written filenames, and errors is a list of
+    (filename, exception) tuples for the files that could not be written.
+    """
+    exported = list()
+    errors = list()
+    # the export is disk bound and pyedflib is not known to be thread safe, so
+    # the files are written one at a time
+    for k, (tr, edfname) in enumerate(exports, 1):
+        if signals.canceled:
+            break
+        # report any error instead of raising it, so that the user still gets
+        # to know which files were written
+        try:
+            tr.emg._edf_export(edfname)
+        except Exception as e:
+            logger.debug(f'could not export {edfname}', exc_info=True)
+            errors.append((edfname, e))
+        else:
+            exported.append(edfname)
+        signals.progress.emit(
+            f'Exporting EDF files: {k} of {len(exports)} done',
+            100 * k / len(exports),
+        )
+    return exported, errors
+
+
+def _convert_videos_and_create_report(vidfiles, signals, **kwargs):
+    """Convert given video files, then create the dash report.
+
+    Run in a worker thread. kwargs are passed to report.web.dash_report.
+    """
+    if vidfiles:
+        convert_videos(vidfiles, check_only=False, signals=signals)
+    _, report = _import_plotting()
+    return report.web.dash_report(signals=signals, **kwargs)
+
 
 def _get_nexus_sessionpath():
     """Get Nexus sessionpath, handle exceptions for use outside _run_in_thread"""
@@ -100,9 +219,17 @@ class PdfReportDialog(QtWidgets.QDialog):
         ui_filename = (
             'pdf_report_dialog_comparison.ui' if comparison else 'pdf_report_dialog.ui'
         )
-        uifile = resource_filename('gaitutils', f'gui/{ui_filename}')
-        uic.loadUi(uifile, self)
+        load_ui(ui_filename, self)
         # self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        # any checkbox starting with 'cb' is taken as a page selection widget
+        # for example, 'cbKineticsCons' generates a page selection called
+        # 'KineticsCons'; the widget names are read from the .ui file once per
+        # process
+        self._page_checkboxes = [
+            (name[2:], getattr(self, name))
+            for name in _ui_widget_names(ui_filename, 'QCheckBox')
+            if name.startswith('cb')
+        ]
         if info is not None:
             if info['fullname'] is not None:
                 self.lnFullName.setText(info['fullname'])
@@ -118,14 +245,8 @@ class PdfReportDialog(QtWidgets.QDialog):
         self.fullname = self.lnFullName.text()
         self.session_description = self.lnDescription.text()
         # take the page selections and write them into a dict
-        # any widget starting with 'cb' is taken as a page selection widget
-        # for example, 'cbKineticsCons' generates a page selection called
-        # 'KineticsCons' which has a value of True/False, according to the widget
-        self.pages = dict()
-        for w in self.findChildren(QtWidgets.QWidget):
-            wname = w.objectName()
-            if wname[:2] == 'cb':
-                self.pages[wname[2:]] = w.checkState()
+        # each page selection has a value of True/False, according to the widget
+        self.pages = {name: w.checkState() for name, w in self._page_checkboxes}
         # require patient name if it's not a comparison report (which might compare different
         # patients); hetu needs to be valid if it's entered
         if (self.comparison or self.fullname) and (
@@ -143,8 +264,7 @@ class WebReportInfoDialog(QtWidgets.QDialog):
 
     def __init__(self, info, parent=None, check_info=True):
         super().__init__()
-        uifile = resource_filename('gaitutils', 'gui/web_report_info.ui')
-        uic.loadUi(uifile, self)
+        load_ui('web_report_info.ui', self)
         # self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
         self.check_info = check_info
         self.xbLimitCycles.stateChanged.connect(self._toggle_spinbox)
@@ -203,8 +323,9 @@ class WebReportDialog(QtWidgets.QDialog):
         super().__init__(parent)
         self.parent = parent
         # load user interface made with designer
-        uifile = resource_filename('gaitutils', 'gui/web_report_dialog.ui')
-        uic.loadUi(uifile, self)
+        load_ui('web_report_dialog.ui', self)
+        # list items of active reports, keyed by report name
+        self._reports_by_name = dict()
         self.btnCreateReport.clicked.connect(lambda ev: self._create_web_report())
         self.btnDeleteReport.clicked.connect(self._delete_current_report)
         self.btnDeleteAllReports.clicked.connect(self._delete_all_reports)
@@ -212,7 +333,7 @@ class WebReportDialog(QtWidgets.QDialog):
         # add double click action to browse current report
         (
             self.listActiveReports.itemDoubleClicked.connect(
-                lambda item: _browse_localhost(port=item.userdata)
+                lambda item: self._browse_report(item.userdata)
             )
         )
         # these require active reports to be enabled
@@ -221,13 +342,14 @@ class WebReportDialog(QtWidgets.QDialog):
             self.btnDeleteAllReports,
             self.btnViewReport,
         ]
+        self._report_buttons_enabled = None
         self._set_report_button_status()
 
     def _create_web_report(self, sessions=None):
         """Collect sessions, create the dash app, start it and launch a
         web browser on localhost on the correct port"""
 
-        if self.listActiveReports.count() == cfg.web_report.max_reports:
+        if self.active_reports == cfg.web_report.max_reports:
             qt_message_dialog(
                 'Maximum number of active web reports active. '
                 'Please delete some reports first.'
@@ -239,20 +361,15 @@ class WebReportDialog(QtWidgets.QDialog):
             if not dlg.exec_():
                 return
             sessions = dlg.sessions
-        report_name = web._report_name(sessions)
-        existing_names = [item.text for item in self.listActiveReports.items]
-        if report_name in existing_names:
+        viz, report = _import_plotting()
+        report_name = report.web._report_name(sessions)
+        if report_name in self._reports_by_name:
             reply = qt_yesno_dialog(
                 f'There is already a report for {report_name}. Recreate?'
             )
             if reply == QtWidgets.QMessageBox.YesRole:
                 # delete the existing one
-                theitem = [
-                    item
-                    for item in self.listActiveReports.items
-                    if item.text == report_name
-                ][0]
-                self._delete_report(theitem)
+                self._delete_report(self._reports_by_name[report_name])
             else:
                 return
 
@@ -296,7 +413,7 @@ class WebReportDialog(QtWidgets.QDialog):
         self.parent.prog = ProgressBar('Creating web report...')
         self.parent.prog.update('Collecting session information...', 0)
         signals = ProgressSignals()
-        signals.progress.connect(lambda text, p: self.parent.prog.update(text, p))
+        signals.progress.connect(self.parent.prog.update)
         self.parent.prog._canceled.connect(signals.cancel)
 
         # for comparison reports, get representative trials only, unless doing
@@ -308,24 +425,30 @@ class WebReportDialog(QtWidgets.QDialog):
 
         # collect all video files for conversion
         # includes tagged dynamic, video-only tagged, and static trials
-        vidfiles = list()
-        for session in sessions:
-            vids = _collect_session_videos(session, tags=tags)
-            vidfiles.extend(vids)
+        vidfiles = list(
+            itertools.chain.from_iterable(
+                _collect_session_videos(session, tags=tags) for session in sessions
+            )
+        )
 
-        if force_convert_videos or not convert_videos(vidfiles, check_only=True):
-            convert_videos(vidfiles, check_only=False, signals=signals)
+        # check the conversion targets only once and convert the missing ones
+        if force_convert_videos:
+            vids_convert = vidfiles
+        else:
+            vids_convert = _videos_to_convert(vidfiles)
 
         max_cycles = cfg.plot.max_cycles.copy()
         if max_model_cycles:
             max_cycles['model'] = max_model_cycles
 
-        # launch the report creation thread
+        # launch the report creation thread; the videos are converted in the
+        # same thread, so that the GUI stays responsive during the conversion
         self.parent._run_in_thread(
-            web.dash_report,
+            _convert_videos_and_create_report,
             block_ui=True,
             finished_func=self.parent._enable_main_ui,
             result_func=self._web_report_ready,
+            vidfiles=vids_convert,
             sessions=sessions,
             info=info,
             max_cycles=max_cycles,
@@ -338,24 +461,28 @@ class WebReportDialog(QtWidgets.QDialog):
     @property
     def active_reports(self):
         """Return number of active web reports"""
-        return self.listActiveReports.count()
+        return len(self._reports_by_name)
 
     def shutdown(self):
         """Try to shutdown web servers"""
-        # cannot use generator here since the loop changes the items
-        for item in list(self.listActiveReports.items):
-            self._delete_report(item)
+        self._delete_reports(list(self._reports_by_name.values()))
 
     def _delete_report(self, item):
         """Shut down server for given list item, remove item"""
-        port = item.userdata
-        # compose url for shutdown request - see report.py
-        url = 'http://127.0.0.1:%d/shutdown' % port
-        # we have to make sure that localhost is not proxied
-        proxies = {"http": None, "https": None}
-        logger.debug('requesting server shutdown for port %d' % port)
-        requests.get(url, proxies=proxies)
-        self.listActiveReports.rm_current_item()
+        self._delete_reports([item])
+
+    def _delete_reports(self, items):
+        """Shut down servers for given list items, remove items"""
+        if not items:
+            return
+        ports = [item.userdata for item in items]
+        # the shutdown requests are independent, so send them concurrently
+        # instead of waiting for each round trip in turn
+        with ThreadPoolExecutor(max_workers=len(ports)) as executor:
+            list(executor.map(_shutdown_report_server, ports))
+        for item in items:
+            del self._reports_by_name[item.text]
+            self.listActiveReports.rm_item(item)
 
     def _delete_current_report(self):
         """Shut down server for current item, remove item"""
@@ -370,15 +497,13 @@ class WebReportDialog(QtWidgets.QDialog):
 
     def _delete_all_reports(self):
         """Delete all web reports"""
-        if self.listActiveReports.count() == 0:
+        if not self.active_reports:
             return
         msg = 'Are you sure you want to delete all reports?'
         reply = qt_yesno_dialog(msg)
         if reply != QtWidgets.QMessageBox.YesRole:
             return
-        # cannot use generator here since the loop changes the items
-        for item in list(self.listActiveReports.items):
-            self._delete_report(item)
+        self._delete_reports(list(self._reports_by_name.values()))
         self._set_report_button_status()
 
     def _view_current_report(self):
@@ -386,14 +511,21 @@ class WebReportDialog(QtWidgets.QDialog):
         item = self.listActiveReports.currentItem()
         if item is None:
             return
-        port = item.userdata
-        _browse_localhost(port=port)
+        self._browse_report(item.userdata)
+
+    def _browse_report(self, port):
+        """Open the report running on given port in browser"""
+        viz, _ = _import_plotting()
+        viz.plot_misc._browse_localhost(port=port)
 
     def _set_report_button_status(self):
         """Enable report buttons if reports exist, otherwise disable them"""
-        n_reports = self.active_reports
+        enabled = self.active_reports > 0
+        if enabled == self._report_buttons_enabled:
+            return
         for widget in self.reportWidgets:
-            widget.setEnabled(True if n_reports else False)
+            widget.setEnabled(enabled)
+        self._report_buttons_enabled = enabled
 
     def _web_report_ready(self, app):
         """Gets called when web report creation is successful. Open report in
@@ -402,27 +534,35 @@ class WebReportDialog(QtWidgets.QDialog):
             # this should only happen when the report was cancelled, so we
             # exit quietly
             return
-        # this code should automatically get a random port from the OS
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.bind(('', 0))
-        s.listen(1)
-        port = s.getsockname()[1]
+        from werkzeug.serving import make_server
+
+        # bind the server to a random free port from the OS; the socket stays
+        # open, so no other process can grab the port before the server starts
+        server = make_server('127.0.0.1', 0, app.server, threaded=True)
+        port = server.server_port
         logging.debug('got port %d' % port)
-        s.close()
+        # the shutdown request handler needs the server instance, see report.web
+        app.server.config['GAITUTILS_SERVER'] = server
         # The web servers need to go into separate threads/processes so that the
         # rest of the app can continue running. Due to difficulties of passing
         # data to processes, we use threads instead (the Qt threadpool). Each
-        # running server then occupies a thread, this means that we need to
-        # increase the threadpool max threads limit; otherwise new servers will
-        # get queued by the threadpool and will not run.
+        # running server occupies a thread for its whole lifetime, so the
+        # servers get a dedicated threadpool; this way they cannot take up the
+        # threads needed by the regular worker tasks.
         self.parent._run_in_thread(
-            app.server.run, block_ui=False, debug=False, port=port, threaded=True
+            _serve_until_shutdown,
+            block_ui=False,
+            threadpool=self.parent.server_threadpool,
+            server=server,
         )
         # double clicking on the list item will browse to corresponding port
-        self.listActiveReports.add_item(app._gaitutils_report_name, data=port)
+        report_name = app._gaitutils_report_name
+        self._reports_by_name[report_name] = self.listActiveReports.add_item(
+            report_name, data=port
+        )
         # enable delete buttons etc.
         self._set_report_button_status()
-        _browse_localhost(port=port)
+        self._browse_report(port)
 
 
 class AddSessionDialog(QtWidgets.QDialog):
@@ -430,8 +570,7 @@ class AddSessionDialog(QtWidgets.QDialog):
 
     def __init__(self, parent):
         QtWidgets.QDialog.__init__(self)
-        uifile = resource_filename('gaitutils', 'gui/add_session_dialog.ui')
-        uic.loadUi(uifile, self)
+        load_ui('add_session_dialog.ui', self)
 
     def accept(self):
         self.c3ds = list()
@@ -456,11 +595,12 @@ class Gaitmenu(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
         # load user interface made with designer
-        uifile = resource_filename('gaitutils', 'gui/gaitmenu.ui')
-        uic.loadUi(uifile, self)
+        load_ui('gaitmenu.ui', self)
 
         # disable editing of log widget text
         self.txtOutput.setReadOnly(True)
+        # limit the log length to bound memory use
+        self.txtOutput.setMaximumBlockCount(10000)
 
         if (
             not cfg.general.allow_multiple_menu_instances
@@ -526,7 +666,24 @@ class Gaitmenu(QtWidgets.QMainWindow):
         # force "item selected" style, otherwise it will depend on focus; set font size
         table_sheet = "QTableView{ selection-background-color: rgba(0, 0, 255, 50%); font-size: 8pt; }"
         self.tableTrials.setStyleSheet(table_sheet)
-        self.tableTrials.cellDoubleClicked.connect(self._cell_doubleclicked)
+        # the actual Trial instances are held by the table model
+        self._trial_model = TrialTableModel(self)
+        self.tableTrials.setModel(self._trial_model)
+        self.tableTrials.doubleClicked.connect(self._cell_doubleclicked)
+        # resize the columns after rows are added; several additions done before
+        # returning to the event loop are coalesced into a single resize
+        self._column_resize_pending = False
+        self._trial_model.rowsInserted.connect(self._schedule_column_resize)
+        # cache of selected rows; invalidated whenever the selection or the rows
+        # change
+        self._selected_rows_cache = None
+        for signal in (
+            self.tableTrials.selectionModel().selectionChanged,
+            self._trial_model.rowsInserted,
+            self._trial_model.rowsRemoved,
+            self._trial_model.modelReset,
+        ):
+            signal.connect(self._invalidate_selection_cache)
 
         # set up radio buttons
         self.rb_map_backend = {'plotly': self.rbPlotly, 'matplotlib': self.rbMatplotlib}
@@ -543,30 +700,37 @@ class Gaitmenu(QtWidgets.QMainWindow):
             self.cbColorStyleVar.addItem(vartype_txt)
 
         # add plot layouts to layout combobox
-        cb_items = sorted(
-            configdot.get_description(lo) or loname for loname, lo in cfg['layouts']
+        # map descriptions to layout names, sorted by description
+        self.layouts_map = dict(
+            sorted(
+                (configdot.get_description(lo) or loname, loname)
+                for loname, lo in cfg['layouts']
+            )
         )
+        cb_items = list(self.layouts_map)
         self.cbLayout.addItems(cb_items)
         # set default option to PiG lower body (if it's on the list)
-        try:
-            default_index = cb_items.index('PiG lower body kinematics')
-        except ValueError:
+        default_desc = 'PiG lower body kinematics'
+        if default_desc in self.layouts_map:
+            default_index = cb_items.index(default_desc)
+        else:
             default_index = 0
         self.cbLayout.setCurrentIndex(default_index)
-        # map descriptions to layout names
-        self.layouts_map = {
-            (configdot.get_description(lo) or loname): loname
-            for loname, lo in cfg['layouts']
-        }
+        self._refresh_layout_cache()
+        self.cbLayout.currentIndexChanged.connect(self._refresh_layout_cache)
 
         XStream.stdout().messageWritten.connect(self._log_message)
         XStream.stderr().messageWritten.connect(self._log_message)
+        # worker threads for regular tasks; the max thread count defaults to
+        # the number of CPU cores
         self.threadpool = QThreadPool()
-        # we need a thread for each web server plus one worker thread
-        self.threadpool.setMaxThreadCount(cfg.web_report.max_reports + 1)
+        # we need a thread for each web server
+        self.server_threadpool = QThreadPool()
+        self.server_threadpool.setMaxThreadCount(cfg.web_report.max_reports)
+        self._runners = set()
         # keep refs to tardieu+mpl windows so they don't get garbage collected
         self._tardieuwin = None
-        self._mpl_windows = list()
+        self._mpl_windows = set()
         # progress bar
         self.prog = None
 
@@ -635,7 +799,7 @@ class Gaitmenu(QtWidgets.QMainWindow):
 
         self.prog = ProgressBar('Running autoprocessing...')
         signals = ProgressSignals()
-        signals.progress.connect(lambda text, p: self.prog.update(text, p))
+        signals.progress.connect(self.prog.update)
         self.prog._canceled.connect(signals.cancel)
 
         self._run_in_thread(
@@ -647,7 +811,7 @@ class Gaitmenu(QtWidgets.QMainWindow):
 
         self.prog = ProgressBar('Running autoprocessing...')
         signals = ProgressSignals()
-        signals.progress.connect(lambda text, p: self.prog.update(text, p))
+        signals.progress.connect(self.prog.update)
         self.prog._canceled.connect(signals.cancel)
 
         self._run_in_thread(
@@ -664,8 +828,9 @@ class Gaitmenu(QtWidgets.QMainWindow):
         session = _get_nexus_sessionpath()
         if session is None:
             return
+        viz, _ = _import_plotting()
         self._run_in_thread(
-            plot_session_average,
+            viz.timedist.plot_session_average,
             finished_func=self._enable_main_ui,
             result_func=self._show_plots,
             session=session,
@@ -677,8 +842,9 @@ class Gaitmenu(QtWidgets.QMainWindow):
         session = _get_nexus_sessionpath()
         if session is None:
             return
+        viz, _ = _import_plotting()
         self._run_in_thread(
-            plot_trial_velocities,
+            viz.plots.plot_trial_velocities,
             finished_func=self._enable_main_ui,
             result_func=self._show_plots,
             session=session,
@@ -690,8 +856,9 @@ class Gaitmenu(QtWidgets.QMainWindow):
         session = _get_nexus_sessionpath()
         if session is None:
             return
+        viz, _ = _import_plotting()
         self._run_in_thread(
-            plot_trial_timedep_velocities,
+            viz.plots.plot_trial_timedep_velocities,
             finished_func=self._enable_main_ui,
             result_func=self._show_plots,
             session=session,
@@ -700,45 +867,57 @@ class Gaitmenu(QtWidgets.QMainWindow):
 
     def _add_trial_to_table(self, tr):
         """Adds a trial to the trials table"""
-        nrows = self.tableTrials.rowCount()
-        self.tableTrials.insertRow(nrows)
-        texts = (
-            tr.trialname,
-            tr.eclipse_data['DESCRIPTION'],
-            tr.eclipse_data['NOTES'],
-            str(tr.sessionpath),
-        )
-        for k, txt in enumerate(texts):
-            item_ = QtWidgets.QTableWidgetItem(txt)
-            if k == 0:
-                # actual Trial instances are stored as userdata of
-                # QTableWidgetItems on each rows 1st column; thus
-                # we don't have to keep separate references to them
-                item_.setData(QtCore.Qt.UserRole, tr)
-            self.tableTrials.setItem(nrows, k, item_)
+        self._add_trials_to_table([tr])
+
+    def _add_trials_to_table(self, trials):
+        """Adds trials to the trials table"""
+        self._trial_model.add_trials(trials)
+
+    def _refresh_layout_cache(self, index=None):
+        """Update the layout name corresponding to the current combobox item"""
+        self._current_layout_name = self.layouts_map[self.cbLayout.currentText()]
+
+    def _schedule_column_resize(self):
+        """Resize the trials table columns once control returns to event loop"""
+        if not self._column_resize_pending:
+            self._column_resize_pending = True
+            QtCore.QTimer.singleShot(0, self._resize_columns)
+
+    def _resize_columns(self):
+        """Resize the trials table columns to their contents"""
+        self._column_resize_pending = False
+        self.tableTrials.resizeColumnsToContents()
 
     def _add_c3dfiles(self, c3dfiles):
         """Add given c3d files to trials list"""
-        c3dfiles = (Path(fn) for fn in c3dfiles)
-        self._disable_main_ui()  # in case it takes a while
-        for c3dfile in c3dfiles:
-            if not c3dfile.is_file():
+        existing = list()
+        for c3dfile in (Path(fn) for fn in c3dfiles):
+            if c3dfile.is_file():
+                existing.append(c3dfile)
+            else:
                 qt_message_dialog(
                     f'Could not find the c3d file {c3dfile} for this trial. '
                     'Please make sure the trial has been processed and saved.'
                 )
-                continue
-            try:
-                tr = trial.Trial(c3dfile)
-            except GaitDataError as e:
+        if not existing:
+            return
+        self._run_in_thread(
+            _load_trials,
+            finished_func=self._enable_main_ui,
+            result_func=self._c3dfiles_loaded,
+            c3dfiles=existing,
+        )
+
+    def _c3dfiles_loaded(self, results):
+        """Add trials loaded by _load_trials() to trials list, report errors"""
+        trials = list()
+        for c3dfile, result in results:
+            if isinstance(result, Exception):
                 title = f'Could not load trial {c3dfile.stem}. Details:'
-                _report_exception(e, title=title)
+                _report_exception(result, title=title)
             else:
-                self._add_trial_to_table(tr)
-                self.tableTrials.resizeColumnsToContents()
-            finally:
-                self._enable_main_ui()  # in case an unexpected exception is raised
-        self._enable_main_ui()  # in case we do not hit the try/finally block
+                trials.append(result)
+        self._add_trials_to_table(trials)
 
     def _add_nexus_trial(self):
         """Add directly from Nexus"""
@@ -748,7 +927,6 @@ class Gaitmenu(QtWidgets.QMainWindow):
             _report_exception(e)
         else:
             self._add_trial_to_table(tr)
-            self.tableTrials.resizeColumnsToContents()
 
     def _add_session_dialog(self):
         """Show the add session dialog and add trials to list"""
@@ -768,35 +946,43 @@ class Gaitmenu(QtWidgets.QMainWindow):
         """Select all trials"""
         self.tableTrials.selectAll()
 
+    def _invalidate_selection_cache(self, *args):
+        """Called when the table selection or rows change"""
+        self._selected_rows_cache = None
+
     @property
     def _selected_rows(self):
         """Return indices of selected rows"""
-        return list(set(idx.row() for idx in self.tableTrials.selectedIndexes()))
+        if self._selected_rows_cache is None:
+            # the table selects whole rows, so selectedRows() gives one index
+            # per row instead of one per cell
+            selection_model = self.tableTrials.selectionModel()
+            self._selected_rows_cache = sorted(
+                idx.row() for idx in selection_model.selectedRows()
+            )
+        return list(self._selected_rows_cache)
 
-    def _cell_doubleclicked(self, row, col):
+    def _cell_doubleclicked(self, index):
         """Plot trial on double click"""
-        tr = self.tableTrials.item(row, 0).data(QtCore.Qt.UserRole)
+        tr = index.data(QtCore.Qt.UserRole)
         self._plot_trials([tr])
 
     @property
     def _selected_trials(self):
         """Return list of trials that are currently selected"""
-        sel_items = (self.tableTrials.item(row, 0) for row in self._selected_rows)
-        return list(item.data(QtCore.Qt.UserRole) for item in sel_items)
+        return [self._trial_model.trials[row] for row in self._selected_rows]
 
     def _remove_selected_trials(self):
         """Remove selected trials from list"""
-        while self._selected_rows:
-            # this relies on _selected_rows dynamically changing after removals
-            row = self._selected_rows[0]
-            self.tableTrials.removeRow(row)
+        self._trial_model.remove_rows(self._selected_rows)
 
     def _export_current_trial_to_edf(self):
         """Export EMG from current trial to an EDF file"""
         if not self._selected_rows:
             qt_message_dialog('Load and select one or more trials first')
             return
-        n_out = 0
+        # ask about overwriting first, so that the export can run in a thread
+        exports = list()
         for tr in self._selected_trials:
             default_edfname = tr.sessionpath / Path(tr.trialname).with_suffix('.edf')
             if default_edfname.is_file():
@@ -805,28 +991,61 @@ class Gaitmenu(QtWidgets.QMainWindow):
                 )
                 if reply == QtWidgets.QMessageBox.NoRole:
                     continue
-            tr.emg._edf_export(default_edfname)
-            n_out += 1
-        if n_out:
-            qt_message_dialog(f'Exported {n_out} edf file(s) into {tr.sessionpath}')
+            exports.append((tr, default_edfname))
+        if not exports:
+            return
+        self.prog = ProgressBar('Exporting EDF files...')
+        signals = ProgressSignals()
+        signals.progress.connect(self.prog.update)
+        self.prog._canceled.connect(signals.cancel)
+        self._run_in_thread(
+            _export_edfs,
+            finished_func=self._enable_main_ui,
+            result_func=self._edfs_exported,
+            exports=exports,
+            signals=signals,
+        )
+
+    def _edfs_exported(self, result):
+        """Report the EDF files written and failed by _export_edfs()"""
+        edfnames, errors = result
+        msgs = list()
+        if edfnames:
+            dirs = sorted({str(edfname.parent) for edfname in edfnames})
+            msgs.append(f"Exported {len(edfnames)} edf file(s) into {', '.join(dirs)}")
+        if errors:
+            msgs.append(f'Could not export {len(errors)} edf file(s):')
+            msgs.extend(f'{edfname}: {_exception_msg(e)}' for edfname, e in errors)
+        if msgs:
+            qt_message_dialog('\n'.join(msgs))
 
     def _plot_selected_trials(self, layout_name=None):
         """Plot user selected trials from list"""
-        if not self._selected_rows:
+        if not (trials := self._selected_trials):
             return
-        if any(tr.is_static for tr in self._selected_trials):
+        have_static = have_avg = False
+        for tr in trials:
+            have_static |= tr.is_static
+            have_avg |= isinstance(tr, stats.AvgTrial)
+            if have_static and have_avg:
+                break
+        if have_static:
             qt_message_dialog(
                 'One or more trials are static, plotting all trials as unnormalized'
             )
-            self._plot_trials(
-                self._selected_trials, normalized=False, layout_name=layout_name
-            )
-        else:
-            self._plot_trials(self._selected_trials, layout_name=layout_name)
+        self._plot_trials(
+            trials,
+            normalized=not have_static,
+            layout_name=layout_name,
+            have_avgtrials=have_avg,
+        )
 
-    def _plot_trials(self, trials, normalized=True, layout_name=None):
+    def _plot_trials(
+        self, trials, normalized=True, layout_name=None, have_avgtrials=None
+    ):
         """Plot specified trials"""
-        have_avgtrials = any(isinstance(tr, stats.AvgTrial) for tr in trials)
+        if have_avgtrials is None:
+            have_avgtrials = any(isinstance(tr, stats.AvgTrial) for tr in trials)
         if not normalized or self.xbPlotUnnorm.checkState():
             if have_avgtrials:
                 qt_message_dialog('Cannot plot average trials as unnormalized')
@@ -835,8 +1054,7 @@ class Gaitmenu(QtWidgets.QMainWindow):
         else:
             cycles = None
         if layout_name is None:
-            layout_desc = self.cbLayout.currentText()
-            layout_name = self.layouts_map[layout_desc]
+            layout_name = self._current_layout_name
         # FIXME: this is a bit kludgy
         is_emg_layout = 'EMG' in layout_name.upper()
         if self.xbEMGEnvelope.checkState():
@@ -846,8 +1064,9 @@ class Gaitmenu(QtWidgets.QMainWindow):
             return
         else:
             emg_mode = None
+        viz, _ = _import_plotting()
         self._run_in_thread(
-            plot_trials,
+            viz.plots.plot_trials,
             finished_func=self._enable_main_ui,
             result_func=self._show_plots,
             trials=trials,
@@ -889,10 +1108,16 @@ class Gaitmenu(QtWidgets.QMainWindow):
             backend = self._plotting_backend
         if backend == 'matplotlib':
             _mpl_win = qt_matplotlib_window(fig)
-            self._mpl_windows.append(_mpl_win)
+            # delete the window (and the figure) once it's closed, and drop our
+            # reference to it
+            _mpl_win.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+            _mpl_win.destroyed.connect(
+                lambda _obj=None, win=_mpl_win: self._mpl_windows.discard(win)
+            )
+            self._mpl_windows.add(_mpl_win)
         elif backend == 'plotly':
-            _show_plotly_fig(fig)
-
+            viz, _ = _import_plotting()
+            viz.plot_misc._show_plotly_fig(fig)
 
     def _convert_session_videos(self):
         """Convert Nexus session videos to web format"""
@@ -907,35 +1132,38 @@ class Gaitmenu(QtWidgets.QMainWindow):
         if not vidfiles:
             qt_message_dialog(f'Cannot find any video files for session {session}')
             return
-        if convert_videos(vidfiles, check_only=True):
+        vids_convert = _videos_to_convert(vidfiles)
+        if not vids_convert:
             reply = qt_yesno_dialog(
                 'It looks like the session videos have already been converted. Redo?'
             )
             if reply == QtWidgets.QMessageBox.NoRole:
                 return
-        self._disable_main_ui()
+            vids_convert = vidfiles
         self.prog = ProgressBar('Converting session videos...')
         signals = ProgressSignals()
-        signals.progress.connect(lambda text, p: self.prog.update(text, p))
+        signals.progress.connect(self.prog.update)
         self.prog._canceled.connect(signals.cancel)
-        convert_videos(vidfiles, check_only=False, signals=signals)
-        self._enable_main_ui()
+        self._run_in_thread(
+            convert_videos,
+            finished_func=self._enable_main_ui,
+            input_files=vids_convert,
+            check_only=False,
+            signals=signals,
+        )
 
     def _postprocess_session(self):
         """Run additional postprocessing pipelines for tagged trials"""
 
         def _run_postprocessing():
             """Helper function that will be run in a separate thread"""
+            # Nexus processes one open trial at a time, so the trials cannot be
+            # run in parallel
             nexus._close_trial()
             for k, tr in enumerate(trials, 1):
                 nexus._open_trial(tr)
-                nexus._run_pipelines_multiprocessing(cfg.autoproc.postproc_pipelines)
-                prog_txt = 'Running postprocessing pipelines: %s for %d trials' % (
-                    cfg.autoproc.postproc_pipelines,
-                    len(trials),
-                )
-                prog_p = 100 * k / float(len(trials))
-                signals.progress.emit(prog_txt, prog_p)
+                nexus._run_pipelines_multiprocessing(pipelines)
+                signals.progress.emit(prog_txt, 100 * k / n_trials)
                 if signals.canceled:
                     logger.debug('postprocessing pipelines were canceled')
                     return
@@ -944,29 +1172,28 @@ class Gaitmenu(QtWidgets.QMainWindow):
         if session is None:
             return
         # XXX: run for tagged + static - maybe this should be configurable
-        trials = sessionutils.get_c3ds(
-            session, tags=cfg.eclipse.tags, trial_type='dynamic', check_if_exists=False
-        )
-        trials += sessionutils.get_c3ds(
-            session, trial_type='static', check_if_exists=False
+        dynamic, static = sessionutils._get_c3ds_multi(
+            session, [(cfg.eclipse.tags, 'dynamic'), (None, 'static')]
         )
-        if trials and cfg.autoproc.postproc_pipelines:
+        trials = dynamic + static
+        pipelines = cfg.autoproc.postproc_pipelines
+        if trials and pipelines:
             logger.debug(f'running postprocessing for {trials}')
-            self.prog = ProgressBar('Running postprocessing pipelines...')
-            self.prog.update(
-                'Running postprocessing pipelines: %s for %d '
-                'trials' % (cfg.autoproc.postproc_pipelines, len(trials)),
-                0,
+            n_trials = len(trials)
+            prog_txt = (
+                f'Running postprocessing pipelines: {pipelines} for {n_trials} trials'
             )
+            self.prog = ProgressBar('Running postprocessing pipelines...')
+            self.prog.update(prog_txt, 0)
             signals = ProgressSignals()
-            signals.progress.connect(lambda text, p: self.prog.update(text, p))
+            signals.progress.connect(self.prog.update)
             self.prog._canceled.connect(signals.cancel)
             self._run_in_thread(
                 _run_postprocessing, block_ui=True, finished_func=self._enable_main_ui
             )
         elif not trials:
             qt_message_dialog('No trials in session to run postprocessing for')
-        elif not cfg.autoproc.postproc_pipelines:
+        elif not pipelines:
             qt_message_dialog('No postprocessing pipelines defined')
 
     def _update_package(self):
@@ -1002,7 +1229,8 @@ class Gaitmenu(QtWidgets.QMainWindow):
 
     def _close_mpl_windows(self):
         """Close all matplotlib windows"""
-        for win in self._mpl_windows:
+        # closing windows removes them from the set
+        for win in list(self._mpl_windows):
             win.close()
 
     def _options_dialog(self):
@@ -1073,6 +1301,7 @@ class Gaitmenu(QtWidgets.QMainWindow):
             return
 
         # create the report
+        viz, report = _import_plotting()
         kwargs = {
             'info': info,
             'pages': dlg_info.pages,
@@ -1080,11 +1309,11 @@ class Gaitmenu(QtWidgets.QMainWindow):
             #'result_func': qt_message_dialog,  # show a message on success
         }
         if comparison:
-            fun = pdf.create_comparison_report
+            fun = report.pdf.create_comparison_report
             kwargs['sessionpaths'] = sessions
             kwargs['write_extracted'] = True
         else:
-            fun = pdf.create_report
+            fun = report.pdf.create_report
             kwargs['sessionpath'] = sessions[0]
             kwargs['write_timedist'] = True
             kwargs['write_extracted'] = True
@@ -1102,8 +1331,9 @@ class Gaitmenu(QtWidgets.QMainWindow):
         """Disable all operation buttons"""
         QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
         self.setEnabled(False)  # disables whole main window
-        # update display immediately in case thread gets blocked
-        QtWidgets.QApplication.processEvents()
+        # repaint immediately in case thread gets blocked; unlike processEvents(),
+        # this does not dispatch pending user input while the UI is being disabled
+        self.repaint()
 
     def _enable_main_ui(self):
         """Enable all operation buttons, close progress bar if any and restore cursor."""
@@ -1115,28 +1345,57 @@ class Gaitmenu(QtWidgets.QMainWindow):
     def _tardieu(self):
         """Open the Tardieu window if it is not currently open"""
         if self._tardieuwin is None or not self._tardieuwin.isVisible():
-            self._tardieuwin = _tardieu.TardieuWindow()
+            # imported on first use, since it is rarely needed
+            from ._tardieu import TardieuWindow
+
+            self._tardieuwin = TardieuWindow()
             self._tardieuwin.show()
 
     def _run_in_thread(
-        self, fun, block_ui=True, finished_func=None, result_func=None, **kwargs
+        self,
+        fun,
+        block_ui=True,
+        finished_func=None,
+        result_func=None,
+        threadpool=None,
+        **kwargs,
     ):
         """Run function fun with args kwargs in a worker thread.
 
         If block_ui==True, disable main ui until worker thread is finished.
         finished_func will be called when thread is finished. result_func
         will be called with the function return value as its single argument,
-        unless an exception is raised during thread execution."""
-        fun_ = partial(fun, **kwargs)
+        unless an exception is raised during thread execution. threadpool
+        is the QThreadPool to use; by default, the main worker pool is used."""
+        fun_ = partial(fun, **kwargs) if kwargs else fun
         if block_ui:
             self._disable_main_ui()
-        self.runner = Runner(fun_)
+        runner = Runner(fun_)
         if finished_func:
-            self.runner.signals.finished.connect(finished_func)
+            runner.signals.finished.connect(finished_func)
         if result_func:
-            self.runner.signals.result.connect(lambda r: result_func(r))
-        self.runner.signals.error.connect(lambda e: _report_exception(e))
-        self.threadpool.start(self.runner)
+            runner.signals.result.connect(result_func)
+        runner.signals.error.connect(_report_exception)
+        # keep a ref to each in-flight runner (and thus its signals) until it
+        # finishes, so that concurrent tasks do not replace each other
+        runner.signals.finished.connect(lambda: self._runners.discard(runner))
+        self._runners.add(runner)
+        if threadpool is None:
+            threadpool = self.threadpool
+        threadpool.start(runner)
+
+
+def _clear_tracebacks(exc):
+    """Drop the tracebacks of an exception and its cause/context chain"""
+    seen = set()
+    pending = [exc]
+    while pending:
+        exc = pending.pop()
+        if exc is None or id(exc) in seen:
+            continue
+        seen.add(id(exc))
+        exc.__traceback__ = None
+        pending.extend((exc.__cause__, exc.__context__))
 
 
 class RunnerSignals(QObject):
@@ -1167,6 +1426,12 @@ class Runner(QRunnable):
             try:
                 retval = self.fun()
             except Exception as e:
+                logger.debug('exception in worker thread', exc_info=True)
+                # the GUI only needs the exception itself; dropping the
+                # tracebacks (also of any chained exceptions) frees the worker
+                # frames and their locals (which may hold large data) instead
+                # of keeping them alive in the queued signal
+                _clear_tracebacks(e)
                 self.signals.error.emit(e)
             else:
                 self.signals.result.emit(retval)
@@ -1176,6 +1441,8 @@ class Runner(QRunnable):
 
 def main():
 
+    config.ensure_user_config()
+    envutils._redirect_pythonw_streams()
     app = QtWidgets.QApplication(sys.argv)
 
     def my_excepthook(type_, value, tback):
@@ -1202,12 +1469,25 @@ def main():
         sys.excepthook = my_excepthook
 
     # add the Qt logging handler to root logger
-    # it shows log messages in our QTextEdit widget
+    # it shows log messages in our QTextEdit widget; the root logger only puts
+    # records into a queue and a listener thread passes them on to the Qt
+    # handler, so logging threads never wait on the handler
     root_logger = logging.getLogger()
+    # read the config before the queue handler is in place, so that any
+    # records logged while loading it are not handled on the listener thread
+    root_logger.setLevel(logging.__dict__[cfg.general.logging_level])
+    # create the streams in the GUI thread, before the listener thread can
+    # touch them
+    XStream.stdout()
+    XStream.stderr()
     handler = QtHandler()
     handler.setFormatter(logging.Formatter("%(levelname)s: %(name)s: %(message)s"))
-    root_logger.addHandler(handler)
-    root_logger.setLevel(logging.__dict__[cfg.general.logging_level])
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    log_listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    log_listener.start()
 
     # quiet down some noisy loggers
     logging.getLogger('matplotlib').setLevel(logging.WARNING)
@@ -1232,3 +1512,4 @@ def main():
     nexus_status = f"Vicon Nexus is {'' if nexus._nexus_pid() else 'not '}running"
     logger.debug(nexus_status)
     app.exec_()
+    log_listener.stop()
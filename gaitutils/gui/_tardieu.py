@@ -28,16 +28,15 @@ import logging
 import sys
 import numpy as np
 import copy
-from pkg_resources import resource_filename
-from PyQt5 import QtGui, QtWidgets, uic, QtCore
+from PyQt5 import QtGui, QtWidgets, QtCore
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
 from matplotlib.backends.backend_pdf import PdfPages
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 
-from .. import nexus, cfg, read_data, GaitDataError
+from .. import nexus, cfg, config, envutils, read_data, GaitDataError
 from ..trial import Trial
 from ..numutils import _segment_angles, rms
-from .qt_dialogs import qt_message_dialog, qt_yesno_dialog
+from .qt_dialogs import qt_message_dialog, qt_yesno_dialog, load_ui
 
 
 matplotlib.style.use(cfg.plot_matplotlib.mpl_style)
@@ -59,8 +58,7 @@ class LoadDialog(QtWidgets.QDialog):
     def __init__(self):
 
         super().__init__()
-        uifile = resource_filename('gaitutils', 'gui/tardieu_load_dialog.ui')
-        uic.loadUi(uifile, self)
+        load_ui('tardieu_load_dialog.ui', self)
         try:
             ang0_nexus = read_nexus_starting_angle()
         except GaitDataError:
@@ -74,8 +72,7 @@ class EMGFilterDialog(QtWidgets.QDialog):
     def __init__(self, emg_passband):
 
         super().__init__()
-        uifile = resource_filename('gaitutils', 'gui/tardieu_filter_dialog.ui')
-        uic.loadUi(uifile, self)
+        load_ui('tardieu_filter_dialog.ui', self)
         self.spEMGLow.setValue(emg_passband[0])
         self.spEMGHigh.setValue(emg_passband[1])
 
@@ -86,8 +83,7 @@ class HelpDialog(QtWidgets.QDialog):
     def __init__(self):
 
         super().__init__()
-        uifile = resource_filename('gaitutils', 'gui/tardieu_help_dialog.ui')
-        uic.loadUi(uifile, self)
+        load_ui('tardieu_help_dialog.ui', self)
 
 
 class SimpleToolbar(NavigationToolbar2QT):
@@ -106,8 +102,7 @@ class TardieuWindow(QtWidgets.QMainWindow):
 
         super().__init__(parent)
 
-        uifile = resource_filename('gaitutils', 'gui/tardieu.ui')
-        uic.loadUi(uifile, self)
+        load_ui('tardieu.ui', self)
 
         self._tardieu_plot = TardieuPlot()
         # set the internal callbacks to point to our methods
@@ -859,6 +854,8 @@ class TardieuPlot:
 
 def main():
 
+    config.ensure_user_config()
+    envutils._redirect_pythonw_streams()
     app = QtWidgets.QApplication(sys.argv)
     win = TardieuWindow()
     win.show()
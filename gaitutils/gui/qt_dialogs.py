@@ -9,8 +9,9 @@ from PyQt5 import uic, QtWidgets
 from PyQt5.QtWidgets import QDialogButtonBox
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-from pkg_resources import resource_filename
 from pathlib import Path
+from functools import lru_cache
+from xml.etree import ElementTree
 import ast
 import io
 from collections import defaultdict
@@ -24,6 +25,45 @@ from ..config import _handle_cfg_defaults, cfg_user_fn, cfg
 logger = logging.getLogger(__name__)
 
 
+@lru_cache()
+def _ui_form_class(uiname):
+    """Compile a Qt Designer .ui file into a form class.
+
+    The compiled class is cached, so the XML is parsed only once per process.
+    """
+    uifile = str(Path(__file__).parent / uiname)
+    form_class, _ = uic.loadUiType(uifile)
+    return form_class
+
+
+@lru_cache()
+def _ui_widget_names(uiname, widget_class):
+    """Return the names of the widgets of given class defined in a .ui file"""
+    uifile = Path(__file__).parent / uiname
+    root = ElementTree.parse(uifile).getroot()
+    return tuple(
+        w.get('name') for w in root.iter('widget') if w.get('class') == widget_class
+    )
+
+
+def load_ui(uiname, baseinstance):
+    """Set up widgets from a .ui file on baseinstance, similar to uic.loadUi().
+
+    Parameters
+    ----------
+    uiname : str
+        Name of the .ui file under the gaitutils/gui directory.
+    baseinstance : QWidget
+        The widget to set up.
+    """
+    form = _ui_form_class(uiname)()
+    form.setupUi(baseinstance)
+    # make the child widgets available as attributes of the base instance,
+    # as uic.loadUi() does
+    for name, obj in vars(form).items():
+        setattr(baseinstance, name, obj)
+
+
 def qt_matplotlib_window(fig):
     """Show matplotlib figure fig in new Qt window. Return the window."""
     _mpl_win = QtWidgets.QDialog()
@@ -374,8 +414,7 @@ class ChooseSessionsDialog(QtWidgets.QDialog):
     def __init__(self, min_sessions=1, max_sessions=3):
         QtWidgets.QDialog.__init__(self)
         # load user interface made with designer
-        uifile = resource_filename('gaitutils', 'gui/sessions.ui')
-        uic.loadUi(uifile, self)
+        load_ui('sessions.ui', self)
         # self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
         self.btnBrowseSession.clicked.connect(self.add_session)
         self.btnAddNexusSession.clicked.connect(
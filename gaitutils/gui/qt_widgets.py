@@ -8,6 +8,7 @@ gaitutils custom Qt widgets
 from PyQt5 import QtCore, QtWidgets
 from PyQt5.QtCore import QObject, pyqtSignal
 import logging
+import threading
 
 
 class NiceListWidgetItem(QtWidgets.QListWidgetItem):
@@ -75,17 +76,98 @@ class NiceListWidget(QtWidgets.QListWidget):
             item.checkstate = False
 
     def add_item(self, txt, data=None, checkable=False, checked=False):
-        """Add checkable item with data. Select new item."""
+        """Add checkable item with data. Select and return new item."""
         item = NiceListWidgetItem(txt, self, checkable=checkable)
         item.userdata = data
         if checkable:
             item.checkstate = checked
         self.setCurrentItem(item)
+        return item
 
     def rm_current_item(self):
         """Remove currently selected item"""
         return self.takeItem(self.row(self.currentItem()))
 
+    def rm_item(self, item):
+        """Remove given item"""
+        return self.takeItem(self.row(item))
+
+
+class TrialTableModel(QtCore.QAbstractTableModel):
+    """Table model for a list of trials.
+
+    Only references to the Trial instances are stored; the cell texts are
+    produced when the view asks for them. The Trial instance of each row is
+    available under Qt.UserRole.
+    """
+
+    HEADERS = ('Trial name', 'Description', 'Notes', 'Full path')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.trials = list()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        # in a table model, valid indices have no children
+        return 0 if parent.isValid() else len(self.trials)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        tr = self.trials[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return self._cell_text(tr, index.column())
+        elif role == QtCore.Qt.UserRole:
+            return tr
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    @staticmethod
+    def _cell_text(tr, column):
+        """Return the text of given column for a trial"""
+        if column == 0:
+            return tr.trialname
+        elif column == 1:
+            return tr.eclipse_data['DESCRIPTION']
+        elif column == 2:
+            return tr.eclipse_data['NOTES']
+        elif column == 3:
+            return str(tr.sessionpath)
+
+    def add_trials(self, trials):
+        """Append trials to the model"""
+        if not trials:
+            return
+        nrows = len(self.trials)
+        self.beginInsertRows(QtCore.QModelIndex(), nrows, nrows + len(trials) - 1)
+        self.trials.extend(trials)
+        self.endInsertRows()
+
+    def removeRows(self, row, count, parent=QtCore.QModelIndex()):
+        if parent.isValid() or count < 1 or row + count > len(self.trials):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.trials[row : row + count]
+        self.endRemoveRows()
+        return True
+
+    def remove_rows(self, rows):
+        """Remove given rows, in as few contiguous blocks as possible"""
+        rows = sorted(set(rows), reverse=True)
+        # remove from the end, so that the remaining row indices stay valid
+        while rows:
+            last = first = rows.pop(0)
+            while rows and rows[0] == first - 1:
+                first = rows.pop(0)
+            self.removeRows(first, last - first + 1)
+
 
 class QtHandler(logging.Handler):
     """Qt logging handler"""
@@ -100,21 +182,60 @@ class QtHandler(logging.Handler):
 
 
 class XStream(QtCore.QObject):
-    """Stream for Qt logging handler"""
+    """Stream for Qt logging handler.
+
+    Written messages are buffered and emitted as a single messageWritten signal
+    at most every FLUSH_INTERVAL ms. This way heavy logging from worker threads
+    does not flood the GUI thread with signals and widget updates. The stream
+    always lives in the GUI thread, regardless of where it was created.
+    """
 
     _stdout = None
     _stderr = None
     messageWritten = QtCore.pyqtSignal(str)
+    _messagesPending = QtCore.pyqtSignal()
+    FLUSH_INTERVAL = 50  # ms
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = list()
+        self._lock = threading.Lock()
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FLUSH_INTERVAL)
+        self._timer.timeout.connect(self.flush)
+        # the timer needs a running event loop, so move the stream (and its
+        # child timer) to the GUI thread in case we were created elsewhere,
+        # e.g. on a logging listener thread
+        app = QtWidgets.QApplication.instance()
+        if app is not None and self.thread() is not app.thread():
+            self.moveToThread(app.thread())
+        # writes may come from any thread, but the timer must be started from
+        # the thread the stream lives in; this connection is queued if needed
+        self._messagesPending.connect(self._start_timer)
+
+    @QtCore.pyqtSlot()
+    def _start_timer(self):
+        self._timer.start()
 
     def flush(self):
-        pass
+        with self._lock:
+            msg = ''.join(self._buffer)
+            self._buffer.clear()
+        if msg:
+            self.messageWritten.emit(msg)
 
     def fileno(self):
         return -1
 
     def write(self, msg):
-        if not self.signalsBlocked():
-            self.messageWritten.emit(msg)
+        if self.signalsBlocked():
+            return
+        with self._lock:
+            flush_pending = bool(self._buffer)
+            self._buffer.append(msg)
+        if not flush_pending:
+            self._messagesPending.emit()
 
     @staticmethod
     def stdout():
@@ -12,7 +12,8 @@ from collections import defaultdict
 import numpy as np
 from pathlib import Path
 import psutil
-import glob
+import os
+import fnmatch
 import logging
 import time
 import multiprocessing
@@ -26,6 +27,7 @@ from .config import cfg
 logger = logging.getLogger(__name__)
 
 vicon_ = None  # global SDK connection object
+_nexus_proc = None  # cached Nexus process, see _nexus_pid()
 
 try:
     from viconnexusapi import ViconNexus
@@ -50,20 +52,26 @@ def _find_nexus_path():
     for vicon_path in vicon_paths:
         if not vicon_path.is_dir():
             continue
-        nexus_glob = str(vicon_path / 'Nexus?.*')
-        nexus_dirs = [Path(dir) for dir in glob.iglob(nexus_glob)]
+        # scandir provides the entry types without extra stat calls
+        with os.scandir(vicon_path) as entries:
+            nexus_dirs = [
+                Path(entry.path)
+                for entry in entries
+                if fnmatch.fnmatch(entry.name, 'Nexus?.*') and entry.is_dir()
+            ]
         logger.debug(f'found Nexus dirs {nexus_dirs}')
         if not nexus_dirs:
             continue
-        nexus_vers = [dir.name[5:] for dir in nexus_dirs]
-        # convert into major, minor lists: [[2,1], [2,10]] etc.
+        # 2-key sort using first major and then minor version number, e.g.
+        # Nexus2.12 -> (2, 12)
         try:
-            nexus_vers = [[int(s) for s in v.split('.')] for v in nexus_vers]
+            nexus_dir = max(
+                nexus_dirs,
+                key=lambda dir: tuple(int(s) for s in dir.name[5:].split('.'))[:2],
+            )
         except ValueError:
             return None
-        # 2-key sort using first major and then minor version number
-        idx = nexus_vers.index(max(nexus_vers, key=lambda l: (l[0], l[1])))
-        nexus_dirs_all.append(nexus_dirs[idx])
+        nexus_dirs_all.append(nexus_dir)
     # return preferable version (64-bit if both are available)
     if nexus_dirs_all:
         return nexus_dirs_all[-1]
@@ -73,10 +81,17 @@ def _find_nexus_path():
 
 def _nexus_pid():
     """Try to return the PID of the currently running Nexus process"""
+    global _nexus_proc
     PROCNAME = "Nexus.exe"
+    # checking the previously found process is much cheaper than iterating
+    # over all processes; is_running() also detects reuse of the PID
+    if _nexus_proc is not None and _nexus_proc.is_running():
+        return _nexus_proc.pid
+    _nexus_proc = None
     for proc in psutil.process_iter(['name']):
         try:
             if proc.info['name'] == PROCNAME:
+                _nexus_proc = proc
                 return proc.pid
         # catch NoSuchProcess for procs that disappear inside loop
         except (psutil.AccessDenied, psutil.NoSuchProcess):
@@ -176,6 +191,8 @@ def get_subjectnames(single_only=True):
     """
     vicon = viconnexus()
     get_sessionpath()  # check whether we can get data
+    # the subjects may be changed in Nexus at any time, so the names are not
+    # cached; callers that need the name several times should pass it on
     names_ = vicon.GetSubjectNames()
     if not names_:
         raise GaitDataError('No subject defined in Nexus')
@@ -195,24 +212,29 @@ def _check_nexus():
     return pid
 
 
-def get_sessionpath():
-    """Get path to current Nexus session.
-
-    Returns
-    -------
-    Path | None
-        The session path, or None if it cannot be acquired.
-    """
+def _get_nexus_trial():
+    """Return (sessionpath, trialname) of the current Nexus trial."""
     try:
         vicon = viconnexus()
-        sessionpath = vicon.GetTrialName()[0]
+        sessionpath, trialname = vicon.GetTrialName()[:2]
     except IOError:  # may be raised if Nexus was just terminated
         raise GaitDataError('Cannot communicate with Nexus')
     if not sessionpath:
         raise GaitDataError(
             'Cannot get Nexus session path, no session or maybe in Live mode?'
         )
-    return Path(sessionpath)
+    return Path(sessionpath), trialname
+
+
+def get_sessionpath():
+    """Get path to current Nexus session.
+
+    Returns
+    -------
+    Path | None
+        The session path, or None if it cannot be acquired.
+    """
+    return _get_nexus_trial()[0]
 
 
 def _run_pipeline(pipeline, foo, timeout):
@@ -227,7 +249,7 @@ def _run_pipelines(pipelines):
     Note: this version will stall the calling Python interpreter until the
     pipeline is finished.
     """
-    if not isinstance(pipelines, list):
+    if isinstance(pipelines, str):
         pipelines = [pipelines]
     for pipeline in pipelines:
         logger.debug(f'running pipeline: {pipeline}')
@@ -242,15 +264,16 @@ def _run_pipelines_multiprocessing(pipelines):
     pipeline, this version causes the invoking thread to sleep and release the
     GIL while the pipeline is running.
     """
-    if not isinstance(pipelines, list):
+    if isinstance(pipelines, str):
         pipelines = [pipelines]
     for pipeline in pipelines:
         logger.debug(f'running pipeline via multiprocessing module: {pipeline}')
         args = (pipeline, '', cfg.autoproc.nexus_timeout)
         p = multiprocessing.Process(target=_run_pipeline, args=args)
         p.start()
-        while p.exitcode is None:
-            time.sleep(0.1)
+        # join() returns as soon as the process exits and releases the GIL
+        # while waiting
+        p.join()
 
 
 def _get_trialname():
@@ -272,7 +295,8 @@ def _check_nexus_trial_identity(sessionpath, trialname):
 
 def _is_vicon_instance(obj):
     """Check if obj is an instance of ViconNexus"""
-    return obj.__class__.__name__ == 'ViconNexus'
+    # without the SDK, there cannot be any instances
+    return NEXUS_IMPORTED and isinstance(obj, ViconNexus.ViconNexus)
 
 
 def _get_nexus_subject_param(vicon, name, param):
@@ -285,12 +309,31 @@ def _get_nexus_subject_param(vicon, name, param):
     return value
 
 
-def _get_marker_names(vicon, trajs_only=True):
+def _get_nexus_subject_params(vicon, name):
+    """Get all subject parameters from Nexus.
+
+    Returns a defaultdict that gives None for unavailable parameters.
+    """
+    # the SDK has no call for reading all values at once, so each parameter
+    # still needs its own call
+    subj_params = defaultdict(lambda: None)
+    subj_params.update(
+        {
+            par: _get_nexus_subject_param(vicon, name, par)
+            for par in vicon.GetSubjectParamNames(name)
+        }
+    )
+    return subj_params
+
+
+def _get_marker_names(vicon, trajs_only=True, subjname=None):
     """Return marker names from Nexus.
 
-    If trajs_only, only return markers with trajectories.
+    If trajs_only, only return markers with trajectories. If subjname is None,
+    the current subject name is read from Nexus.
     """
-    subjname = get_subjectnames()
+    if subjname is None:
+        subjname = get_subjectnames()
     markers = vicon.GetMarkerNames(subjname)
     # only get markers with trajectories - excludes calibration markers
     if trajs_only:
@@ -305,19 +348,13 @@ def _get_metadata(vicon):
     _check_nexus()
     logger.debug('reading metadata from Vicon Nexus')
     subj_name = get_subjectnames()
-    params_available = vicon.GetSubjectParamNames(subj_name)
-    subj_params = defaultdict(lambda: None)
-    subj_params.update(
-        {
-            par: _get_nexus_subject_param(vicon, subj_name, par)
-            for par in params_available
-        }
-    )
+    subj_params = _get_nexus_subject_params(vicon, subj_name)
     trialname = _get_trialname()
     if not trialname:
         raise GaitDataError('No trial loaded in Nexus')
     sessionpath = get_sessionpath()
-    markers = _get_marker_names(vicon)
+    # reuse the subject name, since looking it up takes several SDK calls
+    markers = _get_marker_names(vicon, subjname=subj_name)
 
     # The offset will be subtracted from event frame numbers to get the correct
     # (0-based) indices for events. For Nexus, the offset is always 1 (Nexus
@@ -338,11 +375,11 @@ def _get_metadata(vicon):
 
     length = vicon.GetFrameCount()
     framerate = vicon.GetFrameRate()
-    devids = vicon.GetDeviceIDs()
-    if not devids:
+    device_details = _get_device_details(vicon)
+    if not device_details:
         raise GaitDataError('Cannot determine analog rate')
     else:
-        analogrates = [vicon.GetDeviceDetails(id)[2] for id in devids]
+        analogrates = [details[2] for details in device_details.values()]
         # some rates may be zero (unused devices?)
         analogrates = [r for r in analogrates if r > 0]
         analogrates = set(analogrates)
@@ -360,7 +397,7 @@ def _get_metadata(vicon):
             analograte = 1000
     samplesperframe = analograte / framerate
     logger.debug(f'{offset=}, {length} frames, {framerate=} {samplesperframe=}')
-    n_forceplates = len(_get_forceplate_ids(vicon))
+    n_forceplates = len(_get_forceplate_ids(vicon, device_details))
 
     return {
         'trialname': trialname,
@@ -405,17 +442,18 @@ def _get_analog_data(vicon, devname):
         'data' (the analog data as shape (N,) ndarray, for each output channel).
     """
     # match devname exactly (not case-sensitive though)
+    device_details = _get_device_details(vicon)
     ids = [
         id_
-        for id_ in vicon.GetDeviceIDs()
-        if vicon.GetDeviceDetails(id_)[0].lower() == devname.lower()
+        for id_, details in device_details.items()
+        if details[0].lower() == devname.lower()
     ]
     if len(ids) > 1:
         raise GaitDataError(f'Multiple matching analog devices for {devname}')
     elif len(ids) == 0:
         raise GaitDataError(f'No matching analog devices for {devname}')
     dev_id = ids[0]
-    dname, dtype, drate, outputids, _, _ = vicon.GetDeviceDetails(dev_id)
+    dname, dtype, drate, outputids, _, _ = device_details[dev_id]
     # gather device outputs; there does not seem to be any reliable way to
     # identify output IDs that have actual EMG signal, so we use the heuristic
     # of units being volts. this may lead to inclusion of some channels (e.g.
@@ -426,7 +464,7 @@ def _get_analog_data(vicon, devname):
         if vicon.GetDeviceOutputDetails(dev_id, outputid)[2] == 'volt'
     ]
 
-    data = dict()
+    chdatas = dict()
     for outputid in emg_outputids:
         # get list of channel names and IDs
         outputname, _, _, _, chnames, chids = vicon.GetDeviceOutputDetails(
@@ -440,24 +478,45 @@ def _get_analog_data(vicon, devname):
             # merging output name and channel name
             if len(emg_outputids) > 1:
                 logger.warning(
-                    'merging output %s and channel name %s for a unique name'
-                    % (outputname, chname)
+                    'merging output %s and channel name %s for a unique name',
+                    outputname,
+                    chname,
                 )
                 chname = f'{outputname}_{chname}'
-            if chname in data:
+            if chname in chdatas:
                 raise RuntimeError('duplicate EMG channel; check Nexus device settings')
-            data[chname] = np.array(chdata)
-    # WIP: sanity checks for data (channel lengths equal, etc.)
-    t = np.arange(len(chdata)) / drate  # time axis
+            chdatas[chname] = chdata
+    # convert all channels at once into a single (nchannels, nsamples) array;
+    # the returned channel data are row views into it
+    nsamples = {len(chdata) for chdata in chdatas.values()}
+    if len(nsamples) > 1:
+        raise GaitDataError(f'Channels of {devname} have different lengths')
+    nsamples = nsamples.pop() if nsamples else 0
+    chdata_all = np.empty((len(chdatas), nsamples))
+    for ind, chdata in enumerate(chdatas.values()):
+        chdata_all[ind] = chdata
+    data = dict(zip(chdatas, chdata_all))
+    t = np.arange(nsamples) / drate  # time axis
     return {'t': t, 'data': data}
 
 
-def _get_forceplate_ids(vicon):
+def _get_device_details(vicon):
+    """Get details of all Nexus devices as a dict keyed by device ID.
+
+    Each SDK call is a round trip to Nexus, so callers that need the details
+    of several devices should get them once here and pass them around.
+    """
+    return {devid: vicon.GetDeviceDetails(devid) for devid in vicon.GetDeviceIDs()}
+
+
+def _get_forceplate_ids(vicon, device_details=None):
     """Get device IDs of Nexus forceplate devices"""
+    if device_details is None:
+        device_details = _get_device_details(vicon)
     return [
-        id
-        for id in vicon.GetDeviceIDs()
-        if vicon.GetDeviceDetails(id)[1].lower() == 'forceplate'
+        devid
+        for devid, details in device_details.items()
+        if details[1].lower() == 'forceplate'
     ]
 
 
@@ -503,7 +562,7 @@ def set_forceplate_data(vicon, fp_index, data, kind='Force'):
         vicon.SetDeviceChannel(fpid, outputid, chid, data_dim)
 
 
-def _get_1_forceplate_data(vicon, devid, coords='global'):
+def _get_1_forceplate_data(vicon, devid, coords='global', details=None):
     """Read data of a single forceplate from Nexus.
 
     Parameters
@@ -514,6 +573,9 @@ def _get_1_forceplate_data(vicon, devid, coords='global'):
         The device id.
     coords : str, optional
         Whether to return data in 'global' or 'local' coordinate system.
+    details : tuple, optional
+        The device details as returned by GetDeviceDetails(). If None, they
+        are read from Nexus.
 
     Returns
     -------
@@ -545,8 +607,10 @@ def _get_1_forceplate_data(vicon, devid, coords='global'):
         getter_fun = vicon.GetDeviceChannel
     else:
         raise ValueError('Invalid coords argument, must be "global" or "local"')
-    logger.debug('reading forceplate data from devid %d' % devid)
-    dname, dtype, drate, outputids, nfp, _ = vicon.GetDeviceDetails(devid)
+    logger.debug('reading forceplate data from devid %d', devid)
+    if details is None:
+        details = vicon.GetDeviceDetails(devid)
+    dname, dtype, drate, outputids, nfp, _ = details
     kinds = ['Force', 'Moment', 'CoP']
     alldata = dict()
     for kind in kinds:
@@ -560,8 +624,10 @@ def _get_1_forceplate_data(vicon, devid, coords='global'):
                 logger.warning(f'could not read force data from {devid=} {outputid=}')
                 return None
             datalist.append(data)
-        alldata[kind] = np.array(datalist).T
-    Ftot = np.linalg.norm(alldata['Force'], axis=1)
+        # build a C-contiguous Nx3 array directly (no transposed view)
+        alldata[kind] = np.column_stack(datalist)
+    F = alldata['Force']
+    Ftot = np.sqrt(np.einsum('ij,ij->i', F, F))
     cop = alldata['CoP']
     # translation and rotation matrices from local to global coordinates
     wR = np.array(nfp.WorldR).reshape(3, 3)
@@ -580,15 +646,14 @@ def _get_1_forceplate_data(vicon, devid, coords='global'):
     )
     lb = np.min(cor, axis=0)
     ub = np.max(cor, axis=0)
-    # check that CoP stays inside plate boundaries
-    cop_ok = np.logical_and(cop[:, 0] >= lb[0], cop[:, 0] <= ub[0]).all()
-    cop_ok &= np.logical_and(cop[:, 1] >= lb[1], cop[:, 1] <= ub[1]).all()
-    if not cop_ok:
+    # check that CoP stays inside plate boundaries (x and y); NaN values
+    # also fail the check
+    cop_xy = cop[:, :2]
+    if not ((cop_xy >= lb[:2]) & (cop_xy <= ub[:2])).all():
         logger.warning('center of pressure outside plate boundaries, clipping to plate')
-        cop[:, 0] = np.clip(cop[:, 0], lb[0], ub[0])
-        cop[:, 1] = np.clip(cop[:, 1], lb[1], ub[1])
+        np.clip(cop_xy, lb[:2], ub[:2], out=cop_xy)
     return {
-        'F': alldata['Force'],
+        'F': F,
         'M': alldata['Moment'],
         'Ftot': Ftot,
         'CoP': cop,
@@ -606,13 +671,14 @@ def _get_forceplate_data(vicon):
     # get forceplate ids
     fpdata = list()
     logger.debug('reading forceplate data from Vicon Nexus')
-    devids = _get_forceplate_ids(vicon)
+    device_details = _get_device_details(vicon)
+    devids = _get_forceplate_ids(vicon, device_details)
     if not devids:
         logger.info('no forceplates detected')
         return None
     logger.debug(f'detected {len(devids)} forceplate(s)')
     for eclipse_ind, devid in enumerate(devids, 1):
-        fpdata_1 = _get_1_forceplate_data(vicon, devid)
+        fpdata_1 = _get_1_forceplate_data(vicon, devid, details=device_details[devid])
         if fpdata_1 is not None:
             # generate the Eclipse key
             fpdata_1['eclipse_key'] = f'FP{eclipse_ind}'
@@ -629,14 +695,15 @@ def _swap_markers(vicon, marker1, marker2):
     vicon.SetTrajectory(subj, marker1, m2[0], m2[1], m2[2], m2[3])
 
 
-def _get_marker_data(vicon, markers, ignore_missing=False):
+def _get_marker_data(vicon, markers, ignore_missing=False, subjname=None):
     """Get position data for specified markers.
 
-    See read_data.get_marker_data for details.
+    See read_data.get_marker_data for details. If subjname is None, the current
+    subject name is read from Nexus.
     """
     if not isinstance(markers, list):
         markers = [markers]
-    subj = get_subjectnames()
+    subj = get_subjectnames() if subjname is None else subjname
     mkrdata = dict()
     for marker in markers:
         x, y, z, _ = vicon.GetTrajectory(subj, marker)
@@ -648,7 +715,8 @@ def _get_marker_data(vicon, markers, ignore_missing=False):
                 raise GaitDataError(
                     f'Cannot read marker trajectory from Nexus: {marker}'
                 )
-        mkrdata[marker] = np.array([x, y, z]).transpose()
+        # build a C-contiguous Nx3 array directly (no transposed view)
+        mkrdata[marker] = np.column_stack((x, y, z))
     return mkrdata
 
 
@@ -663,11 +731,10 @@ def _get_model_data(vicon, model):
     for var in model.read_vars:
         nums, bools = vicon.GetModelOutput(subj, var)
         if nums:
-            data = np.squeeze(np.array(nums))
+            data = np.asarray(nums).squeeze()
         else:
             logger.info(f'cannot read variable {var}, returning nans')
-            data = np.empty(var_dims)
-            data[:] = np.nan
+            data = np.full(var_dims, np.nan)
         modeldata[var] = data
     return modeldata
 
@@ -750,7 +817,7 @@ def rigid_body_extrapolate(
         _open_trial(extrap_trial)
         subjname = get_subjectnames()
         try:
-            mdata_ref = _get_marker_data(vicon, ref_markers)
+            mdata_ref = _get_marker_data(vicon, ref_markers, subjname=subjname)
         except GaitDataError:
             raise GaitDataError(
                 f'cannot read markers from extrapolation trial {extrap_trial}'
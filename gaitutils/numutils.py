@@ -11,6 +11,7 @@ Misc numerical utils
 import logging
 import numpy as np
 import hashlib
+from functools import lru_cache
 from scipy import signal
 from scipy.signal import medfilt
 from scipy.special import erfcinv
@@ -355,13 +356,36 @@ def _running_sum(M, win, axis=None):
     length. Uses cumulative sum, inspired by:
     http://arogozhnikov.github.io/2015/09/30/NumpyTipsAndTricks2.html"""
     if axis is None:
-        M = M.flatten()
-    s = np.cumsum(M, axis=axis)
-    s = np.insert(s, 0, [0], axis=axis)
-    len_ = s.shape[0] if axis is None else s.shape[axis]
-    return s.take(np.arange(win, len_), axis=axis) - s.take(
-        np.arange(0, len_ - win), axis=axis
+        M = M.ravel()
+        axis = 0
+    # accumulate floats in at least double precision; for single precision
+    # data, the window sums are differences of large running totals and would
+    # lose most of their precision
+    acc_dtype = np.promote_types(M.dtype, np.float64) if M.dtype.kind == 'f' else None
+    s = np.cumsum(M, axis=axis, dtype=acc_dtype)
+    out_dtype = s.dtype if acc_dtype is None else M.dtype
+    len_ = s.shape[axis]
+    if win > len_:
+        # no complete windows
+        out_shape = list(s.shape)
+        out_shape[axis] = 0
+        return np.empty(out_shape, dtype=out_dtype)
+
+    def _slice(start, stop):
+        """Index expression for slicing s along the given axis"""
+        sl = [slice(None)] * s.ndim
+        sl[axis] = slice(start, stop)
+        return tuple(sl)
+
+    # window sum at i is s[i + win - 1] - s[i - 1], where s[-1] == 0
+    out_shape = list(s.shape)
+    out_shape[axis] = len_ - win + 1
+    out = np.empty(out_shape, dtype=s.dtype)
+    out[_slice(0, 1)] = s[_slice(win - 1, win)]
+    np.subtract(
+        s[_slice(win, len_)], s[_slice(0, len_ - win)], out=out[_slice(1, None)]
     )
+    return out.astype(out_dtype, copy=False)
 
 
 def rms(data, win, axis=None, pad_mode=None):
@@ -423,22 +447,53 @@ def _linear_envelope(data, sfrate, axis=None):
     return _filtfilt(data_rect, [0, cfg.emg.linear_envelope_lowpass], sfrate, axis=axis)
 
 
+@lru_cache()
+def _butter_sos(passband, sfrate, buttord=5):
+    """Design a Butterworth filter in second-order sections format.
+
+    passband must be a hashable sequence, e.g. (1, 40). The filter is
+    implemented as pure lowpass, if highpass freq = 0. The designs are
+    cached, since the same filters get requested over and over again.
+    """
+    passbandn = 2 * np.array(passband) / sfrate
+    if passbandn[0] > 0:  # bandpass
+        return signal.butter(buttord, passbandn, 'bandpass', output='sos')
+    else:  # lowpass
+        return signal.butter(buttord, passbandn[1], output='sos')
+
+
+def _filtfilt_padlen(sos):
+    """Return the edge padding length that filtfilt() would use for sos"""
+    b, a = signal.sos2tf(sos)
+    return 3 * max(len(np.trim_zeros(a, 'b')), len(np.trim_zeros(b, 'b')))
+
+
+def _filtfilt_sos(data, sos, axis=None):
+    """Forward-backward filter using precomputed second-order sections.
+
+    The edges are padded the same way as in filtfilt(), so the result matches
+    filtfilt() with the equivalent transfer function up to rounding errors.
+    Single precision data is filtered in single precision.
+    """
+    if axis is None:
+        axis = -1  # sosfiltfilt() default
+    padlen = _filtfilt_padlen(sos)
+    if data.dtype == np.float32:
+        # sosfiltfilt() would otherwise promote to the dtype of sos (float64)
+        sos = sos.astype(np.float32)
+    return signal.sosfiltfilt(sos, data, axis=axis, padtype='odd', padlen=padlen)
+
+
 def _filtfilt(data, passband, sfrate, buttord=5, axis=None):
     """Forward-backward filter.
     Filter data into given passband, e.g. [1, 40].
     Frequencies are given in Hz along with sfrate (sampling rate).
     Implemented as pure lowpass, if highpass freq = 0.
     """
-    if axis is None:
-        axis = -1  # filtfilt() default
     if passband is None:
         return data
-    passbandn = 2 * np.array(passband) / sfrate
-    if passbandn[0] > 0:  # bandpass
-        b, a = signal.butter(buttord, passbandn, 'bandpass')
-    else:  # lowpass
-        b, a = signal.butter(buttord, passbandn[1])
-    return signal.filtfilt(b, a, data, axis=axis)
+    sos = _butter_sos(tuple(passband), sfrate, buttord)
+    return _filtfilt_sos(data, sos, axis=axis)
 
 
 def _get_local_max(data):
@@ -65,6 +65,12 @@ def _make_dropdown_lists(options):
 
 def _shutdown_server():
     """Shutdown flask server, see http://flask.pocoo.org/snippets/67/"""
+    # servers started with werkzeug.serving.make_server() are stored in the app
+    # config by the GUI; werkzeug >= 2.1 no longer provides the shutdown
+    # function in the request environment
+    if (server := flask.current_app.config.get('GAITUTILS_SERVER')) is not None:
+        server.shutdown()
+        return
     func = request.environ.get('werkzeug.server.shutdown')
     if func is None:
         raise RuntimeError('Not running with the Werkzeug Server')
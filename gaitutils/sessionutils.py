@@ -224,28 +224,33 @@ def _get_session_enfs(sessionpath):
         yield Path(fp)
 
 
-def _filter_by_eclipse_keys(enfs, patterns, eclipse_keys):
-    """Filter for enfs whose Eclipse key values match given patterns."""
+def _filter_by_eclipse_keys(enfs, patterns, eclipse_keys, key_reader=None):
+    """Filter for enfs whose Eclipse key values match given patterns.
+
+    key_reader can be used to supply already read Eclipse keys for each enf.
+    """
     if not isinstance(patterns, list):
         patterns = [patterns]
     if not isinstance(eclipse_keys, list):
         eclipse_keys = [eclipse_keys]
+    if key_reader is None:
+        key_reader = get_eclipse_keys
     for enf in enfs:
-        ecldi = {key.upper(): val.upper() for key, val in get_eclipse_keys(enf).items()}
+        ecldi = {key.upper(): val.upper() for key, val in key_reader(enf).items()}
         eclvals = [val for key, val in ecldi.items() if key in eclipse_keys]
         for pattern in patterns:
             if any(pattern.upper() in eclval for eclval in eclvals):
                 yield enf
 
 
-def _filter_by_tags(enfs, tags):
+def _filter_by_tags(enfs, tags, key_reader=None):
     """Filter by given tags"""
-    return _filter_by_eclipse_keys(enfs, tags, cfg.eclipse.tag_keys)
+    return _filter_by_eclipse_keys(enfs, tags, cfg.eclipse.tag_keys, key_reader)
 
 
-def _filter_by_type(enfs, trial_type):
+def _filter_by_type(enfs, trial_type, key_reader=None):
     """Filter by trial type"""
-    return _filter_by_eclipse_keys(enfs, trial_type, 'TYPE')
+    return _filter_by_eclipse_keys(enfs, trial_type, 'TYPE', key_reader)
 
 
 def _filter_to_c3ds(enfs):
@@ -323,6 +328,37 @@ def get_c3ds(sessionpath, tags=None, trial_type=None, check_if_exists=True):
     return list(c3ds)
 
 
+def _get_c3ds_multi(sessionpath, filters):
+    """Get c3d files for a session for several filters at once.
+
+    Parameters
+    ----------
+    sessionpath : str | Path
+        The session path.
+    filters : list
+        List of (tags, trial_type) tuples. These are applied as in get_c3ds().
+
+    Returns
+    -------
+    list
+        List of c3d file lists, one for each filter.
+
+    The session directory is listed and each .enf file is read only once.
+    Existence of the c3d files is not checked.
+    """
+    enf_keys = {enf: get_eclipse_keys(enf) for enf in _get_session_enfs(sessionpath)}
+    key_reader = enf_keys.__getitem__
+    c3ds = list()
+    for tags, trial_type in filters:
+        enfs = enf_keys.keys()
+        if trial_type is not None:
+            enfs = _filter_by_type(enfs, trial_type, key_reader)
+        if tags:
+            enfs = _filter_by_tags(enfs, tags, key_reader)
+        c3ds.append(list(_filter_to_c3ds(enfs)))
+    return c3ds
+
+
 def _get_tagged_dynamic_c3ds_from_sessions(sessions, tags=None):
     """Gather all tagged dynamic c3d files from given sessions."""
     if not isinstance(sessions, list):
@@ -70,7 +70,6 @@ def _step_width(source):
     from .trial import Trial
 
     tr = Trial(source)
-    sw = dict()
     mkr = 'TOE'  # marker name without context
     mkrdata = tr._full_marker_data
     # XXX: could use cycles here, instead of iterating over foot strikes
@@ -80,34 +79,47 @@ def _step_width(source):
             ev.frame
             for ev in tr.events.get_events(event_type='strike', context=context)
         ]
+    return _step_width_from_strikes(mkrdata, strike_frames, mkr)
+
+
+def _step_width_from_strikes(mkrdata, strike_frames, mkr):
+    """Compute step width from marker data and foot strike frames.
+
+    mkrdata is a dict of marker data, strike_frames is a context keyed dict of
+    foot strike frames and mkr is the marker name without context. See
+    _step_width for details.
+    """
+    sw = dict()
     for context in 'LR':
-        strikes = strike_frames[context]
+        strikes = np.asarray(strike_frames[context], dtype=int)
         sw[context] = list()
         nstrikes = len(strikes)
         if nstrikes < 2:
             continue
         # contralateral vars
         context_co = 'L' if context == 'R' else 'R'
-        strikes_co = strike_frames[context_co]
-        mname = context + mkr
-        mname_co = context_co + mkr
-        for j, strike in enumerate(strikes):
-            if strike == strikes[-1]:  # last strike on this context
-                break
-            pos_this = mkrdata[mname][strike]
-            pos_next = mkrdata[mname][strikes[j + 1]]
-            strikes_next_co = [k for k in strikes_co if k > strike]
-            if len(strikes_next_co) == 0:  # no subsequent contralateral strike
-                break
-            pos_next_co = mkrdata[mname_co][strikes_next_co[0]]
-            # vector distance between 'step lines' (see url above)
-            V1 = pos_next - pos_this
-            V1 /= np.linalg.norm(V1)
-            VC = pos_next_co - pos_this
-            VCP = V1 * np.dot(VC, V1)  # proj to ipsilateral line
-            VSW = VCP - VC
-            # marker data is in mm, but return step width in m
-            sw[context].append(np.linalg.norm(VSW) / 1000.0)
+        strikes_co = np.asarray(strike_frames[context_co], dtype=int)
+        P = mkrdata[context + mkr]
+        P_co = mkrdata[context_co + mkr]
+        # for each ipsilateral strike (except the last one), find the index of
+        # the next contralateral strike; cycles without a subsequent
+        # contralateral strike are dropped
+        strikes_this, strikes_next = strikes[:-1], strikes[1:]
+        inds_co = np.searchsorted(strikes_co, strikes_this, side='right')
+        ok = inds_co < len(strikes_co)
+        if not ok.any():
+            continue
+        pos_this = P[strikes_this[ok]]
+        pos_next = P[strikes_next[ok]]
+        pos_next_co = P_co[strikes_co[inds_co[ok]]]
+        # vector distance between 'step lines' (see url above)
+        V1 = pos_next - pos_this
+        V1 /= np.sqrt(np.einsum('ij,ij->i', V1, V1))[:, None]
+        VC = pos_next_co - pos_this
+        VCP = V1 * np.einsum('ij,ij->i', VC, V1)[:, None]  # proj to ipsilateral line
+        VSW = VCP - VC
+        # marker data is in mm, but return step width in m
+        sw[context] = list(np.sqrt(np.einsum('ij,ij->i', VSW, VSW)) / 1000.0)
     return sw
 
 
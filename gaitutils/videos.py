@@ -10,10 +10,11 @@ import os
 from pathlib import Path
 import glob
 import itertools
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 import platform
 import subprocess
-import time
 
 from .config import cfg
 from . import sessionutils, numutils
@@ -28,8 +29,8 @@ def convert_videos(input_files, check_only=False, signals=None):
 
     Parameters
     ----------
-    input_files : list | str | Path
-        List of video filenames to convert, or a single filename
+    input_files : iterable | str | Path
+        Video filenames to convert, or a single filename
     check_only : bool, optional
         Instead of converting, return True if all files are already converted
         (all conversion target files exist).
@@ -51,7 +52,7 @@ def convert_videos(input_files, check_only=False, signals=None):
             progress_p = 100 * n_complete / float(n_total)
             signals.progress.emit(progress_txt, progress_p)
 
-    if not isinstance(input_files, list):
+    if isinstance(input_files, (str, Path)):
         input_files = [input_files]
     input_files = [Path(vidfile) for vidfile in input_files]
     # conversion target filenames
@@ -92,15 +93,12 @@ def convert_videos(input_files, check_only=False, signals=None):
             cmd = [VIDCONV_BIN] + vidconv_opts
         proc_cmds.append(cmd)
 
-    # launch up to MAX_NPROCS_PARALLEL processes for starters
+    # run the conversions, keeping up to MAX_NPROCS_PARALLEL processes busy;
+    # a new process is started as soon as a previous one completes
     procs = []
-    for _ in range(MAX_NPROCS_PARALLEL):
-        if proc_cmds:
-            cmd = proc_cmds.pop()
-            procs.append(subprocess.Popen(cmd, **POPEN_ARGS))
-
-    # if needed, start new processes in a sleep loop as previous ones complete
-    while proc_cmds:
+    n_complete = 0
+    n_complete_emitted = None
+    while proc_cmds or procs:
 
         if signals is not None and signals.canceled:
             logger.debug('canceled, killing video converter processes')
@@ -108,47 +106,66 @@ def convert_videos(input_files, check_only=False, signals=None):
                 p.kill()
             break
 
-        n_active = len([p for p in procs if p.poll() is None])
-        n_complete = len(procs) - n_active
-        if n_active < MAX_NPROCS_PARALLEL:
+        procs_running = [p for p in procs if p.poll() is None]
+        n_complete += len(procs) - len(procs_running)
+        procs = procs_running
+        while proc_cmds and len(procs) < MAX_NPROCS_PARALLEL:
             cmd = proc_cmds.pop()
             procs.append(subprocess.Popen(cmd, **POPEN_ARGS))
 
-        _emit_progress(n_complete)
-        time.sleep(0.1)
+        # only signal when the progress has changed, to avoid needless repaints
+        if n_complete != n_complete_emitted:
+            _emit_progress(n_complete)
+            n_complete_emitted = n_complete
+        if procs:
+            # block on the oldest running process, which is usually the next
+            # to finish; the timeout keeps the cancel check responsive
+            try:
+                procs[0].wait(timeout=0.1)
+            except subprocess.TimeoutExpired:
+                pass
 
     # finished, emit 100% progress
-    _emit_progress(n_total)
+    if n_complete_emitted != n_total:
+        _emit_progress(n_total)
+
+
+def _videos_to_convert(input_files):
+    """Return the video files whose conversion targets do not exist yet"""
+    return [
+        Path(vidfile)
+        for vidfile in input_files
+        if not Path(vidfile).with_suffix(cfg.general.video_converted_ext).is_file()
+    ]
+
 
 def _collect_session_videos(session, tags):
     """Collect session .avi files (trial videos). This only collects
     files for tagged dynamic trials, extra video-only trials and static trials."""
-    c3ds = sessionutils.get_c3ds(
-        session, tags=tags, trial_type='dynamic', check_if_exists=False
-    )
-    c3ds += sessionutils.get_c3ds(
+    dynamic, vid_only, static = sessionutils._get_c3ds_multi(
         session,
-        tags=cfg.eclipse.video_tags,
-        trial_type='dynamic',
-        check_if_exists=False,
+        [(tags, 'dynamic'), (cfg.eclipse.video_tags, 'dynamic'), (None, 'static')],
     )
-    c3ds += sessionutils.get_c3ds(session, trial_type='static')
+    static = sessionutils._filter_exists(static)
+    # a trial may match several filters; collect its videos only once
+    c3ds = dict.fromkeys(itertools.chain(dynamic, vid_only, static))
     camlabels = set(cfg.general.camera_labels.values())
-    # for each trial, pick at most one avi and one overlay avi per camera
-    vids_it = (
-        get_trial_videos(
-            c3d,
-            camera_label=camlabel,
-            vid_ext='.avi',
-            overlay=overlay,
-            single_file=True,
-        )
-        for c3d in c3ds
-        for camlabel in camlabels
-        for overlay in [True, False]
-    )
-    # chain resulting video files into single list
-    return list(itertools.chain.from_iterable(vids_it))
+    # glob the directory once per trial instead of once per camera and overlay
+    # type; the globs are I/O bound (session dirs are often on network
+    # shares), so run them concurrently
+    get_avis = partial(get_trial_videos, vid_ext='.avi')
+    with ThreadPoolExecutor(max_workers=min(16, len(c3ds) or 1)) as executor:
+        vids_per_trial = list(executor.map(get_avis, c3ds))
+    vids = list()
+    for trial_vids in vids_per_trial:
+        trial_vids = [str(vid) for vid in trial_vids]
+        # for each trial, pick at most one avi and one overlay avi per camera
+        for camlabel in camlabels:
+            for overlay in [True, False]:
+                vids_ = _filter_by_label(trial_vids, camlabel)
+                vids_ = _filter_by_overlay(vids_, overlay)
+                vids.extend(Path(vid) for vid in sorted(vids_)[-1:])
+    return vids
 
 
 def get_trial_videos(
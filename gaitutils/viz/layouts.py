@@ -69,14 +69,13 @@ def _rm_dead_channels(emgs, layout):
     if not isinstance(emgs, list):
         emgs = [emgs]
     chs_ok = None
+    chs = [ch for row in layout for ch in row]
+    emg_chs = [ch for ch in chs if ch in cfg.emg.channel_labels]
     for i, emg in enumerate(emgs):
         # accept channels w/ status ok, or anything that is NOT a
         # preconfigured EMG channel
-        chs_ok_ = [
-            ch not in cfg.emg.channel_labels or emg.status_ok(ch)
-            for row in layout
-            for ch in row
-        ]
+        statuses = emg.channel_statuses(emg_chs)
+        chs_ok_ = [statuses.get(ch, True) for ch in chs]
         # previously OK chs propagated as ok
         chs_ok = [a or b for a, b in zip(chs_ok, chs_ok_)] if i > 0 else chs_ok_
     if not chs_ok:
@@ -9,9 +9,9 @@ from setuptools import setup, find_packages
 console_entries = [
     'gaitmenu=gaitutils.gui._gaitmenu:main',
     'tardieu=gaitutils.gui._tardieu:main',
-    'nexus_autoproc_session=gaitutils.autoprocess:autoproc_session',
-    'nexus_autoproc_trial=gaitutils.autoprocess:autoproc_trial',
-    'nexus_automark_trial=gaitutils.autoprocess:automark_trial',
+    'nexus_autoproc_session=gaitutils.autoprocess:_autoproc_session_cli',
+    'nexus_autoproc_trial=gaitutils.autoprocess:_autoproc_trial_cli',
+    'nexus_automark_trial=gaitutils.autoprocess:_automark_trial_cli',
     'gaitmenu_make_shortcut=gaitutils.envutils:_make_gaitutils_shortcut',
 ]
 
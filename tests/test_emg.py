@@ -7,6 +7,8 @@ Test EMG functions.
 """
 
 import logging
+import numpy as np
+import pytest
 import tempfile
 import tempfile
 from pathlib import Path
@@ -63,6 +65,25 @@ def test_emg_detect_bads():
     cfg.emg.autodetect_bads = False
 
 
+def test_emg_valid_emg_spikes():
+    """Test that sparse out-of-range spikes make a channel invalid"""
+    fn = r'2018_12_17_preOp_RR21.c3d'
+    fpath = sessiondir_abs / fn
+    e = emg.EMG(fpath)
+    var_lo, var_hi = cfg.emg.variance_ok
+    # valid noise, with large spikes that a strided subsample would miss
+    rng = np.random.default_rng(0)
+    data = rng.normal(scale=np.sqrt((var_lo * var_hi) ** 0.5), size=4096 * 10)
+    assert e._is_valid_emg(data)
+    data[5::1000] = 100 * np.sqrt(var_hi)
+    assert np.var(data) > var_hi
+    assert not e._is_valid_emg(data)
+    # a flat channel is rejected too
+    assert not e._is_valid_emg(np.zeros(4096 * 10))
+    # a channel with too large variance everywhere is rejected early
+    assert not e._is_valid_emg(data + 10 * np.sqrt(var_hi) * np.sign(data))
+
+
 def test_emg_write_edf():
     """Test the edf writer"""
     fn = r'2018_12_17_preOp_RR21.c3d'
@@ -102,3 +123,39 @@ def test_emg_get_data():
         assert chdata.shape == (1000,)
         chdata = e.get_channel_data(chname, envelope=True)
         assert chdata.shape == (1000,)
+    # the cached raw data must not be writable
+    for chdata in e.data.values():
+        with pytest.raises(ValueError):
+            chdata[0] = 0
+
+
+def test_emg_filtered_cache():
+    """Test caching of filtered EMG data"""
+    fn = r'2018_12_17_preOp_RR04.c3d'
+    fpath = sessiondir_abs / fn
+    e = emg.EMG(fpath)
+    chdata = e.get_channel_data('LGas')
+    # the returned array must not allow modifying the cached data
+    with pytest.raises(ValueError):
+        chdata[:] = 0
+    chdata2 = e.get_channel_data('LGas')
+    assert (chdata2 == chdata).all()
+    # changing the correction factor rescales the data
+    e.correction_factor = 2
+    chdata3 = e.get_channel_data('LGas')
+    assert (chdata3 == 2 * chdata2).all()
+
+
+def test_emg_invalid_chname():
+    """Test rejection of invalid channel names"""
+    fn = r'2018_12_17_preOp_RR04.c3d'
+    fpath = sessiondir_abs / fn
+    e = emg.EMG(fpath)
+    for chname in ['', None]:
+        with pytest.raises(ValueError):
+            e.get_channel_data(chname)
+    # single character names never match
+    with pytest.raises(KeyError):
+        e.get_channel_data('L')
+    assert not e.has_channel('L')
+    assert not e.has_channel('NoSuchChannel')
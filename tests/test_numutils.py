@@ -11,7 +11,13 @@ import numpy as np
 from numpy.testing import assert_allclose
 import logging
 
-from gaitutils.numutils import _segment_angles, digitize_array, rms
+from gaitutils.numutils import (
+    _segment_angles,
+    digitize_array,
+    rms,
+    _running_sum,
+    _filtfilt,
+)
 
 # from utils import _file_path, cfg
 
@@ -71,3 +77,40 @@ def test_rms():
     )
     assert_allclose(rms(np.arange(10), win=3), arms)
     # XXX: still needs a proper 2-d computation for completeness
+
+
+def test_rms_float32():
+    """Test that single precision rms matches double precision on long data"""
+    rng = np.random.default_rng(0)
+    # signal level drops 100x halfway; a naive float32 cumulative sum would
+    # zero out the envelope of the quiet half
+    x = rng.standard_normal(60000)
+    x[30000:] /= 100
+    rms64 = rms(x, 31)
+    rms32 = rms(x.astype(np.float32), 31)
+    assert rms32.dtype == np.float32
+    assert_allclose(rms32, rms64, rtol=1e-4)
+
+
+def test_running_sum_short_data():
+    """Test running sum with a window longer than the data"""
+    assert _running_sum(np.ones(5), 6).shape == (0,)
+    assert _running_sum(np.ones((3, 5)), 6, axis=1).shape == (3, 0)
+
+
+def test_filtfilt_edges():
+    """Test that the SOS filter matches filtfilt(), including the edges"""
+    from scipy import signal
+
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((2, 1000))
+    sfrate = 1000.0
+    for passband, ba in [
+        ([10, 400], signal.butter(5, [0.02, 0.8], 'bandpass')),
+        ([0, 40], signal.butter(5, 0.08)),
+    ]:
+        y = _filtfilt(data, passband, sfrate, axis=1)
+        y_ref = signal.filtfilt(*ba, data, axis=1)
+        assert_allclose(y, y_ref, atol=1e-8)
+        assert_allclose(y[:, :50], y_ref[:, :50], atol=1e-8)
+        assert_allclose(y[:, -50:], y_ref[:, -50:], atol=1e-8)
@@ -41,6 +41,22 @@ def test_get_c3ds():
     assert len(c3ds) == 0
 
 
+def test_get_c3ds_multi():
+    """Test getting c3ds for several filters at once"""
+    filters = [
+        (['E1'], 'dynamic'),
+        (None, 'dynamic'),
+        (['foo'], None),
+        (None, 'static'),
+    ]
+    c3ds = sessionutils._get_c3ds_multi(sessiondir_abs, filters)
+    assert len(c3ds) == len(filters)
+    for (tags, trial_type), c3ds_ in zip(filters, c3ds):
+        assert c3ds_ == sessionutils.get_c3ds(
+            sessiondir_abs, tags=tags, trial_type=trial_type, check_if_exists=False
+        )
+
+
 def test_get_enfs():
     """Test enfs getter"""
     # should get all
@@ -17,8 +17,11 @@ from gaitutils.utils import (
     _pig_markerset,
     _check_markers_flipped,
     marker_gaps,
+    _step_width,
+    _step_width_from_strikes,
 )
-from utils import _file_path
+from gaitutils import read_data
+from utils import _file_path, _c3d_path
 
 
 logger = logging.getLogger(__name__)
@@ -81,3 +84,70 @@ def test_point_in_poly():
     assert not _point_in_poly(poly, pt)
     pt = np.array([0.5, 0.5, 0])
     assert _point_in_poly(poly, pt)
+
+
+def _step_width_loop(mkrdata, strike_frames, mkr):
+    """Reference step width computation, as a plain loop over the strikes"""
+    sw = dict()
+    for context in 'LR':
+        strikes = strike_frames[context]
+        sw[context] = list()
+        if len(strikes) < 2:
+            continue
+        context_co = 'L' if context == 'R' else 'R'
+        strikes_co = strike_frames[context_co]
+        mname = context + mkr
+        mname_co = context_co + mkr
+        for j, strike in enumerate(strikes):
+            if strike == strikes[-1]:  # last strike on this context
+                break
+            pos_this = mkrdata[mname][strike]
+            pos_next = mkrdata[mname][strikes[j + 1]]
+            strikes_next_co = [k for k in strikes_co if k > strike]
+            if len(strikes_next_co) == 0:  # no subsequent contralateral strike
+                break
+            pos_next_co = mkrdata[mname_co][strikes_next_co[0]]
+            V1 = pos_next - pos_this
+            V1 /= np.linalg.norm(V1)
+            VC = pos_next_co - pos_this
+            VCP = V1 * np.dot(VC, V1)
+            VSW = VCP - VC
+            sw[context].append(np.linalg.norm(VSW) / 1000.0)
+    return sw
+
+
+def test_step_width_from_strikes():
+    """Test step width computation against a plain loop implementation"""
+    rng = np.random.default_rng(0)
+    mkrdata = {'LTOE': rng.normal(size=(500, 3)), 'RTOE': rng.normal(size=(500, 3))}
+    mkrdata = {mkr: 1000 * data for mkr, data in mkrdata.items()}
+    strike_sets = [
+        # alternating strikes
+        {'L': [10, 110, 210, 310], 'R': [60, 160, 260, 360]},
+        # no contralateral strike follows the last left strikes
+        {'L': [10, 110, 210, 310, 410], 'R': [60, 160]},
+        # no contralateral strikes at all
+        {'L': [10, 110, 210], 'R': []},
+        # contralateral strike on the same frame is not counted
+        {'L': [10, 110, 210], 'R': [10, 110, 300]},
+        # too few strikes
+        {'L': [10], 'R': [60]},
+    ]
+    for strike_frames in strike_sets:
+        sw = _step_width_from_strikes(mkrdata, strike_frames, 'TOE')
+        sw_ref = _step_width_loop(mkrdata, strike_frames, 'TOE')
+        for context in 'LR':
+            assert len(sw[context]) == len(sw_ref[context])
+            assert_allclose(sw[context], sw_ref[context], rtol=1e-12)
+
+
+def test_step_width():
+    """Test step width computation against the value written by Nexus"""
+    c3dfile = _c3d_path('double_contact.c3d')
+    an = read_data.get_analysis(c3dfile, 'c3dtest')['c3dtest']
+    sw = _step_width(c3dfile)
+    for context, context_name in zip('LR', ['Left', 'Right']):
+        assert len(sw[context]) > 0
+        assert all(w > 0 for w in sw[context])
+        # Nexus may use different cycles, so allow some deviation
+        assert_allclose(np.mean(sw[context]), an['Step Width'][context_name], rtol=0.1)
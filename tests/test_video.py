@@ -34,10 +34,12 @@ def test_convert_videos():
         vidfile.unlink()
     # check should not find target videos any more
     assert not videos.convert_videos(original_vids, check_only=True)
+    assert videos._videos_to_convert(original_vids) == original_vids
     # start conversion process
     videos.convert_videos(original_vids)
     # check that conversion target videos exist now
     assert videos.convert_videos(original_vids, check_only=True)
+    assert not videos._videos_to_convert(original_vids)
 
 
 def test_collect_session_videos():